@@ -0,0 +1,56 @@
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from src.config import settings
+from src.middlewares.profiling import profile_store
+from src.repositories.users import UsersRepository
+from src.services.token_cache import verified_tokens
+
+
+def check_admin_token(x_admin_token: str | None = Header(None)) -> None:
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Доступ запрещён")
+
+
+router = APIRouter(
+    prefix="/v1/admin",
+    tags=["Служебные"],
+    dependencies=[Depends(check_admin_token)],
+)
+
+
+@router.get(
+    "/cache-stats",
+    summary="Статистика кэша репозиториев",
+    description="Попадания, промахи и объединённые запросы кэша чтения и кэша проверенных токенов",
+)
+async def get_cache_stats():
+    return {
+        "users": UsersRepository.cache.stats() if UsersRepository.cache else None,
+        "tokens": verified_tokens.stats(),
+    }
+
+
+@router.get(
+    "/profiles",
+    summary="Список профилей запросов",
+    description="Профили, снятые ProfilingMiddleware (новые первыми)",
+)
+async def list_profiles():
+    return profile_store.list()
+
+
+@router.get(
+    "/profiles/{name}",
+    summary="Профиль запроса",
+    description="Время по фазам (event loop, БД, bcrypt, сериализация) и статистика стеков",
+)
+async def get_profile(name: str):
+    path = profile_store.get_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Профиль не найден")
+    return FileResponse(path, media_type="application/json")
@@ -1,12 +1,17 @@
 import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, HTTPException, Body, Response
-from fastapi import BackgroundTasks
+from fastapi.responses import JSONResponse
 from starlette.requests import Request
 
+from src.config import settings
+from src.schemas.refresh_tokens import RefreshTokenAdd
 from src.schemas.users import UserAdd, UserRegisterRequest, UserLoginRequest, AuthCheckResponse
 from src.services.auth_service import AuthService
 from src.services.email_service import EmailService
+from src.services.token_revocation import token_revocation
 from src.api.dependencies import DBDep, UserDep
 
 from src.utils.openapi_examples import user_register_examples, user_login_examples
@@ -16,6 +21,45 @@ logger = get_auth_logger()
 
 router = APIRouter(prefix="/v1/auth", tags=["Авторизация и аутентификация"])
 
+REFRESH_COOKIE = "ft_refresh_token"
+REFRESH_COOKIE_PATH = "/api/v1/auth"  # Refresh-токен уходит только на эндпоинты авторизации
+
+
+def _set_access_cookie(response: Response, access_token: str) -> None:
+    response.set_cookie(
+        "ft_access_token",
+        access_token,
+        httponly=True,
+        secure=True,  # Для HTTPS
+        samesite="lax",
+        max_age=AuthService.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # Как в JWT
+    )
+
+
+async def _issue_refresh_token(db: DBDep, response: Response, user_id: int, family_id: str) -> None:
+    """Создаёт refresh-токен в цепочке family_id и кладёт его в отдельную httpOnly cookie"""
+    token, token_hash, expires_at = AuthService().create_refresh_token()
+    await db.refresh_tokens.add(RefreshTokenAdd(
+        user_id=user_id,
+        token_hash=token_hash,
+        family_id=family_id,
+        expires_at=expires_at,
+    ))
+    response.set_cookie(
+        REFRESH_COOKIE,
+        token,
+        httponly=True,
+        secure=True,
+        samesite="strict",
+        path=REFRESH_COOKIE_PATH,
+        max_age=AuthService.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+    )
+
+
+def _clear_auth_cookies(response: Response) -> None:
+    response.delete_cookie("ft_access_token", httponly=True, secure=True, samesite="lax")
+    response.delete_cookie(REFRESH_COOKIE, path=REFRESH_COOKIE_PATH, httponly=True, secure=True, samesite="strict")
+
 
 @router.post(
     "/register",
@@ -24,7 +68,6 @@ router = APIRouter(prefix="/v1/auth", tags=["Авторизация и ауте
 )
 async def register(
         db: DBDep,
-        background_tasks: BackgroundTasks,
         user_data: UserRegisterRequest = Body(openapi_examples=user_register_examples),
 ):
     """
@@ -34,13 +77,14 @@ async def register(
     - Отправляет письмо со ссылкой для подтверждения
     """
 
-    # Нормализация email
+    # Нормализация email и логина: логин хранится без пробелов по краям, как его ищет UsersRepository.normalize
     email = user_data.email.strip().lower()
+    login = user_data.login.strip()
 
     # Проверка уникальности
     if await db.users.email_exists(email):
         raise HTTPException(status_code=409, detail="Email уже занят")
-    if await db.users.login_exists(user_data.login):
+    if await db.users.login_exists(login):
         raise HTTPException(status_code=409, detail="Логин уже занят")
 
     # Хешируем только пароль
@@ -48,24 +92,24 @@ async def register(
 
     # Сохраняем пользователя (email хранится как есть)
     new_user = UserAdd(
-        login=user_data.login,
+        login=login,
         email=email,
         hashed_password=hashed_password,
         email_verified=False
     )
 
     await db.users.add(new_user)
-    await db.commit()
 
     # 3. Генерируем токен подтверждения
-    verify_token = EmailService().create_email_token(user_data.email)
+    verify_token = EmailService().create_email_token(email)
 
-    # 4. Отправляем письмо
-    background_tasks.add_task(
-        EmailService.send_verification_email,
-        user_data.email, user_data.login,
-        verify_token  # Отправляем токен, а не хеш
+    # 4. Ставим письмо в очередь задач в той же транзакции, что и пользователя
+    await db.jobs.enqueue(
+        "email.verification",
+        {"email": email, "login": login, "token": verify_token},  # Токен, а не хеш
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
     )
+    await db.commit()
 
     return {"status": "ok", "message": "Письмо с подтверждением отправлено"}
 
@@ -111,6 +155,10 @@ async def login_user(
             await asyncio.sleep(0.5)
             raise HTTPException(status_code=401, detail="Неверный логин или пароль")
 
+        # Хеш со старой стоимостью bcrypt пересчитываем, пока известен пароль
+        if AuthService.password_needs_rehash(user.hashed_password):
+            await db.users.update_password(user.id, AuthService.hash_password(data.password))
+
         # 3. Проверяем подтверждение email (если требуется)
         # if not user.email_verified:
         #     raise HTTPException(
@@ -125,15 +173,10 @@ async def login_user(
             "email_verified": user.email_verified,
         })
 
-        # 5. Устанавливаем cookie
-        response.set_cookie(
-            "ft_access_token",
-            access_token,
-            httponly=True,
-            secure=True,  # Для HTTPS
-            samesite="lax",
-            max_age=30 * 60,  # 30 минут (как в JWT)
-        )
+        # 5. Устанавливаем cookie (access + refresh новой цепочки ротаций)
+        _set_access_cookie(response, access_token)
+        await _issue_refresh_token(db, response, user.id, family_id=uuid.uuid4().hex)
+        await db.commit()
 
         return {
             "status": "success",
@@ -150,6 +193,53 @@ async def login_user(
         await db.session.close()
 
 
+@router.post(
+    "/refresh",
+    summary="Обновление access-токена",
+    description="Выдаёт новый access-токен по refresh-токену из cookie и ротирует refresh-токен",
+)
+async def refresh_tokens(db: DBDep, request: Request, response: Response):
+    token = request.cookies.get(REFRESH_COOKIE)
+    if not token:
+        raise HTTPException(status_code=401, detail="Refresh-токен не предоставлен")
+
+    record = await db.refresh_tokens.get_with_user(AuthService.hash_refresh_token(token))
+    if record is None:
+        raise HTTPException(status_code=401, detail="Неверный refresh-токен")
+    stored, user = record
+
+    # Токен только что ротирован параллельным запросом (несколько вкладок с одной cookie).
+    # Новая пара уже выдана первому запросу, цепочку не отзываем - клиент повторит запрос
+    now = datetime.now(timezone.utc)
+    grace = timedelta(seconds=AuthService.REFRESH_REUSE_GRACE_SECONDS)
+    rotated_concurrently = stored.revoked_at is None and not await db.refresh_tokens.revoke(stored.id)
+    if rotated_concurrently or (stored.revoked_at is not None and now - stored.revoked_at <= grace):
+        return JSONResponse(status_code=409, content={"detail": "Refresh-токен уже обновлён параллельным запросом"})
+
+    # Повторное предъявление давно ротированного токена - признак кражи: отзываем всю цепочку
+    if stored.revoked_at is not None:
+        await db.refresh_tokens.revoke_family(stored.family_id)
+        await db.commit()
+        logger.warning(f"Refresh token reuse detected: user_id={user.id}, family={stored.family_id}")
+        rejected = JSONResponse(status_code=401, content={"detail": "Refresh-токен уже использован"})
+        _clear_auth_cookies(rejected)
+        return rejected
+
+    if stored.expires_at <= now:
+        raise HTTPException(status_code=401, detail="Refresh-токен истёк")
+
+    access_token = AuthService().create_access_token({
+        "user_id": user.id,
+        "user_login": user.login,
+        "email_verified": user.email_verified,
+    })
+    _set_access_cookie(response, access_token)
+    await _issue_refresh_token(db, response, user.id, family_id=stored.family_id)
+    await db.commit()
+
+    return {"status": "success"}
+
+
 @router.get(
     "/check-auth",
     summary="Проверка авторизации. Служебный api",
@@ -170,15 +260,30 @@ async def check_auth(user_data: UserDep):
 @router.post(
     "/logout",
     summary="Выход пользователя из системы",
-    description="Удаляет JWT из cookies и возвращает статус"
+    description="Отзывает JWT и refresh-токен, удаляет их из cookies и возвращает статус"
 )
-async def logout(response: Response):
-    response.delete_cookie(
-        "ft_access_token",
-        httponly=True,
-        secure=True,
-        samesite="lax",
-    )
+async def logout(db: DBDep, request: Request, response: Response):
+    token = request.cookies.get("ft_access_token")
+    if token:
+        try:
+            payload = AuthService.decode_token(token)
+        except HTTPException:
+            payload = None  # Истёкший или невалидный токен отзывать не нужно
+        if payload and payload.get("jti"):
+            try:
+                await token_revocation.revoke(payload["jti"], payload["exp"])
+            except Exception as e:
+                # Локально токен уже отозван; выход не должен падать из-за недоступной рассылки
+                logger.error(f"Token revocation publish failed: {e}")
+
+    refresh_token = request.cookies.get(REFRESH_COOKIE)
+    if refresh_token:
+        record = await db.refresh_tokens.get_with_user(AuthService.hash_refresh_token(refresh_token))
+        if record is not None:
+            await db.refresh_tokens.revoke_family(record[0].family_id)
+            await db.commit()
+
+    _clear_auth_cookies(response)
     return {
         "status": "success",
         "message": "Сессия завершена",
@@ -189,7 +294,6 @@ async def logout(response: Response):
 @router.post("/password-reset/request")
 async def request_password_reset(
         db: DBDep,
-        background_tasks: BackgroundTasks,
         email: str = Body(..., embed=True),
 ):
     """Запрос на сброс пароля (отправка письма)"""
@@ -198,11 +302,12 @@ async def request_password_reset(
         return {"status": f"Пользователь с email {email} не найден"}
 
     reset_token = AuthService.create_password_reset_token(user.email)
-    background_tasks.add_task(
-        EmailService.send_password_reset_email,
-        user.email,
-        reset_token
+    await db.jobs.enqueue(
+        "email.password_reset",
+        {"email": user.email, "token": reset_token},
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
     )
+    await db.commit()
     return {"status": f"Письмо с инструкциями для восстановления пароля отправлены на {email}"}
 
 
@@ -4,7 +4,8 @@ import jwt
 from fastapi import Depends, HTTPException, Request
 
 from src.schemas.users import UserAuthResponse
-from src.services.auth_service import AuthService
+from src.services.token_cache import verified_tokens
+from src.services.token_revocation import token_revocation
 from src.utils.db_manager import DBManager
 from src.users_db import async_session_maker
 
@@ -18,21 +19,27 @@ async def get_db():
 DBDep = Annotated[DBManager, Depends(get_db)]
 
 
-def get_token(request: Request) -> str:
+async def get_token(request: Request) -> str:
     token = request.cookies.get("ft_access_token", None)
     if not token:
         raise HTTPException(status_code=401, detail="Токен не предоставлен")
     return token
 
 
-def get_current_user_id(token: str = Depends(get_token)) -> int:
+async def get_current_user_id(token: str = Depends(get_token)) -> int:
+    """Без I/O, поэтому async: FastAPI выполняет синхронные зависимости в пуле потоков"""
     try:
-        data = AuthService().decode_token(token)
-        return data["user_id"]
+        data = verified_tokens.decode(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Токен истёк")
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Неверный токен")
+    if token_revocation.is_revoked(data.get("jti")):
+        raise HTTPException(status_code=401, detail="Токен отозван")
+    return data["user_id"]
+
+
+UserIdDep = Annotated[int, Depends(get_current_user_id)]
 
 
 async def get_current_user(db: DBDep, user_id: int = Depends(get_current_user_id)) -> dict:
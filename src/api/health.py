@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from src.middlewares.load_shedding import admission_controller
+
+router = APIRouter(prefix="/v1/health", tags=["Служебные"])
+
+
+@router.get(
+    "/live",
+    summary="Проверка, что процесс отвечает",
+)
+async def live():
+    return {"status": "ok"}
+
+
+@router.get(
+    "/ready",
+    summary="Готовность принимать запросы",
+    description="503 с Retry-After, пока воркер перегружен (задержка event loop, запросы в обработке, пул БД)",
+)
+async def ready():
+    stats = admission_controller.stats()
+    if stats["overloaded"]:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "overloaded", **stats},
+            headers={"Retry-After": str(admission_controller.retry_after())},
+        )
+    return {"status": "ready", **stats}
@@ -0,0 +1,36 @@
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from src.api.dependencies import UserIdDep
+from src.schemas.market import CandlesResponse
+from src.services.market_data import market_data_cache
+
+router = APIRouter(prefix="/v1/market", tags=["Рыночные данные"])
+
+
+@router.get(
+    "/candles",
+    summary="Свечи для графика",
+    description="Отдаёт OHLC-свечи из кэша рыночных данных без обращения к базе данных",
+    response_model=CandlesResponse,
+)
+async def get_candles(
+        _: UserIdDep,
+        symbol: str,
+        timeframe: Literal["M1", "M5", "M15", "M30", "H1", "H4", "D1"] = "M1",
+        date_from: int | None = Query(None, description="Начало периода (unix, секунды)"),
+        date_to: int | None = Query(None, description="Конец периода (unix, секунды, не включительно)"),
+        limit: int = Query(1000, ge=1, le=10000, description="Максимальное количество последних баров"),
+):
+    candles = market_data_cache.get_candles(symbol, timeframe, date_from, date_to)[-limit:]
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "time": candles["time"].tolist(),
+        "open": candles["open"].tolist(),
+        "high": candles["high"].tolist(),
+        "low": candles["low"].tolist(),
+        "close": candles["close"].tolist(),
+        "volume": candles["volume"].tolist(),
+    }
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Response
+
+from src.api.dependencies import UserIdDep
+from src.schemas.leaderboard import LeaderboardResponse, StrategyStats
+from src.services.leaderboard import strategy_leaderboard
+
+router = APIRouter(prefix="/v1/strategies", tags=["Стратегии"])
+
+
+@router.get(
+    "/leaderboard",
+    summary="Рейтинг стратегий",
+    description="Последователи, AUM, доходность и просадка стратегий. Отдаётся готовый снимок без обращения к БД",
+    response_model=LeaderboardResponse,
+)
+async def get_leaderboard(_: UserIdDep):
+    return Response(content=strategy_leaderboard.snapshot.body, media_type="application/json")
+
+
+@router.get(
+    "/{strategy}",
+    summary="Статистика стратегии",
+    response_model=StrategyStats,
+)
+async def get_strategy(_: UserIdDep, strategy: str):
+    stats = strategy_leaderboard.snapshot.by_name.get(strategy)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Стратегия не найдена")
+    return stats
@@ -0,0 +1,118 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+from src.api.dependencies import DBDep, UserIdDep
+from src.config import settings
+from src.schemas.deals import DealsExportQueued
+from src.services import deals_export
+from src.services.advisor_service import AdvisorService
+from src.users_db import async_session_maker
+
+router = APIRouter(prefix="/v1/trading", tags=["Торговля"])
+
+
+@router.get(
+    "/advisor",
+    summary="Скачать советник",
+    description="Отдаёт бинарный файл советника (EA). Поддерживаются ETag/If-None-Match и Range",
+)
+async def download_advisor(
+        _: UserIdDep,
+        if_none_match: str | None = Header(None),
+):
+    advisor = await AdvisorService.get_file()
+    headers = {
+        "ETag": advisor.etag,
+        "Cache-Control": "private, no-cache",  # Кэшировать можно, но только с ревалидацией
+    }
+
+    if AdvisorService.etag_matches(if_none_match, advisor.etag):
+        return Response(status_code=304, headers=headers)
+
+    filename = advisor.path.name
+    if settings.ADVISOR_ACCEL_REDIRECT:
+        # Байты отдаёт nginx из internal location (sendfile, Range), воркер только авторизует запрос
+        headers["X-Accel-Redirect"] = settings.ADVISOR_ACCEL_REDIRECT
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return Response(headers=headers, media_type="application/octet-stream")
+
+    return FileResponse(
+        advisor.path,
+        filename=filename,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+@router.get(
+    "/deals/export",
+    summary="Выгрузка истории сделок",
+    description=(
+        "История сделок по всем счетам пользователя в CSV или Parquet, период - даты включительно (UTC). "
+        "Небольшие выгрузки отдаются потоком, большие готовит фоновая задача (ответ 202 со ссылкой на файл)"
+    ),
+    responses={202: {"model": DealsExportQueued}},
+)
+async def export_deals(
+        request: Request,
+        db: DBDep,
+        user_id: UserIdDep,
+        format: Literal["csv", "parquet"] = "csv",
+        date_from: date | None = Query(None, description="Первый день периода"),
+        date_to: date | None = Query(None, description="Последний день периода"),
+):
+    if format == "parquet" and not deals_export.parquet_available():
+        raise HTTPException(status_code=501, detail="Выгрузка в Parquet недоступна на сервере")
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=422, detail="date_from позже date_to")
+
+    start, end = deals_export.export_period(date_from, date_to)
+    if await db.deals.count_for_export(user_id, start, end) > settings.EXPORT_STREAM_MAX_ROWS:
+        export_id = deals_export.new_export_id()
+        await db.jobs.enqueue(
+            "deals.export",
+            {
+                "user_id": user_id,
+                "export_id": export_id,
+                "format": format,
+                "date_from": date_from and date_from.isoformat(),
+                "date_to": date_to and date_to.isoformat(),
+            },
+            max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        )
+        await db.commit()
+        return Response(
+            status_code=202,
+            content=DealsExportQueued(
+                export_id=export_id,
+                download_url=str(request.url_for("download_deals_export", name=f"{export_id}.{format}")),
+            ).model_dump_json(),
+            media_type="application/json",
+        )
+
+    filename = f"deals_{date_from or 'start'}_{date_to or 'now'}.{format}"
+    batches = deals_export.iter_deal_batches(async_session_maker, user_id, start, end)
+    return StreamingResponse(
+        deals_export.encode(format, batches),
+        media_type=deals_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/deals/exports/{name}",
+    summary="Файл выгрузки сделок",
+    description="Файл, подготовленный фоновой задачей. 404, пока выгрузка не готова или после истечения срока хранения",
+)
+async def download_deals_export(user_id: UserIdDep, name: str):
+    path = deals_export.find_export(user_id, name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Выгрузка не найдена или ещё формируется")
+    return FileResponse(
+        path,
+        filename=f"deals.{path.suffix.lstrip('.')}",
+        media_type=deals_export.MEDIA_TYPES[path.suffix.lstrip(".")],
+    )
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,11 +14,86 @@ class Settings(BaseSettings):
         return (
             f"postgresql+asyncpg://{self.USERS_DB_USER}:{self.USERS_DB_PASS}@{self.USERS_DB_HOST}:{self.USERS_DB_PORT}/{self.USERS_DB_NAME}")
 
+    # Пул соединений SQLAlchemy (значения по умолчанию совпадают с QueuePool)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+
     DOMAIN: str
 
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
 
+    # Стоимость bcrypt (log2 числа итераций), не ниже 10. Подбор: python -m src.utils.bcrypt_calibrate
+    BCRYPT_ROUNDS: int = Field(12, ge=10)
+
+    # Отзыв токенов: memory - только текущий воркер, postgres - общий для всех воркеров
+    TOKEN_REVOCATION_BACKEND: str = "memory"
+    TOKEN_REVOCATION_BLOOM: bool = True
+
+    # Кэш проверенных access-токенов (0 - проверять подпись на каждом запросе)
+    TOKEN_CACHE_SIZE: int = 10_000
+
+    # Кэш чтения репозиториев
+    REPO_CACHE_ENABLED: bool = False
+    REPO_CACHE_SIZE: int = 10_000
+    REPO_CACHE_TTL: float = 30.0  # секунды
+
+    # Служебные эндпоинты (/v1/admin), заголовок X-Admin-Token. Пустое значение - отключены
+    ADMIN_TOKEN: str = ""
+
+    # Сброс нагрузки: при превышении порогов маршруты низкого приоритета получают 503
+    LOAD_SHED_ENABLED: bool = True
+    LOAD_SHED_MAX_LAG: float = 0.25  # секунды задержки event loop
+    LOAD_SHED_MAX_INFLIGHT: int = 200  # запросов в обработке на воркер
+    LOAD_SHED_MAX_POOL_USAGE: float = 0.9  # доля занятых соединений пула БД
+    LOAD_SHED_COOLDOWN: float = 5.0  # секунды после последнего превышения
+
+    # Очередь фоновых задач. JOBS_INPROCESS_WORKER=false - задачи выполняет отдельный процесс (python -m src.worker)
+    JOBS_INPROCESS_WORKER: bool = True
+    JOBS_CONCURRENCY: int = 4
+    JOBS_BATCH_SIZE: int = 10
+    JOBS_POLL_INTERVAL: float = 1.0  # секунды
+    JOBS_MAX_ATTEMPTS: int = 5
+    JOBS_STALE_AFTER: float = 600.0  # секунды без отметки выполнения, после которых задача считается брошенной
+
+    # Периодическая очистка (истёкшие refresh-токены и т.п.), секунды
+    MAINTENANCE_INTERVAL: float = 3600.0
+
+    # Профилирование запросов: заголовок X-Profile с PROFILING_TOKEN или случайная выборка
+    PROFILING_TOKEN: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL: float = 0.005  # секунды между семплами стека
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 200
+
+    # Синхронизация сделок с брокерами
+    BROKER_SYNC_ENABLED: bool = False
+    BROKER_SYNC_INTERVAL: float = 60.0  # секунды между циклами
+    BROKER_SYNC_CONCURRENCY: int = 8  # одновременных запросов к одному брокеру
+    BROKER_HTTP_TIMEOUT: float = 15.0
+    ICMARKETS_REPORT_URL: str = ""
+    MT5_WEBAPI_URL: str = ""
+
+    # Рейтинг стратегий: инкрементальное обновление и периодический полный пересчёт
+    LEADERBOARD_ENABLED: bool = True
+    LEADERBOARD_REFRESH_INTERVAL: float = 60.0  # секунды
+    LEADERBOARD_REBUILD_INTERVAL: float = 3600.0  # секунды
+
+    # Кэш рыночных данных
+    MARKET_DATA_DIR: str = "market_data"  # Пустая строка - только в памяти
+    MARKET_TICKS_CAPACITY: int = 100_000
+    MARKET_CANDLES_CAPACITY: int = 50_000  # ~35 дней минутных свечей
+
+    # Выгрузка истории сделок. Больше EXPORT_STREAM_MAX_ROWS строк - файл готовит фоновая задача
+    EXPORT_DIR: str = "exports"
+    EXPORT_BATCH_SIZE: int = 5000  # строк на пачку курсора / row group Parquet
+    EXPORT_STREAM_MAX_ROWS: int = 200_000
+    EXPORT_TTL: float = 86400.0  # секунды хранения готовых файлов
+
+    # Файл советника (EA)
+    ADVISOR_PATH: str = "files/advisor/ForwardTrading.ex5"
+    ADVISOR_ACCEL_REDIRECT: str = ""  # Например, /protected/advisor/ForwardTrading.ex5 (internal location nginx)
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
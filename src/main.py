@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -7,10 +9,27 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from src.api.admin import router as router_admin
 from src.api.auth import router as router_auth
+from src.api.health import router as router_health
+from src.api.market import router as router_market
+from src.api.strategies import router as router_strategies
+from src.api.trading import router as router_trading
 
 from contextlib import asynccontextmanager
+from src.config import settings
 from src.core.logsetup import setup_logging
+from src.middlewares.load_shedding import LoadSheddingMiddleware, admission_controller
+from src.middlewares.profiling import ProfilingMiddleware, ProfiledJSONResponse
+import src.services.job_handlers  # noqa: F401 - регистрация обработчиков задач
+from src.services.broker_sync import BrokerSyncScheduler, create_broker_clients, create_http_client
+from src.services.job_queue import JobWorker
+from src.services.leaderboard import strategy_leaderboard
+from src.services.maintenance import purge_exports, purge_refresh_tokens, run_periodically
+from src.services.market_data import market_data_cache
+from src.services.token_revocation import token_revocation, create_revocation_backend
+from src.users_db import async_session_maker, engine
+from src.utils.profiling import install_sqlalchemy_hooks
 from src.utils.logger import get_app_logger
 
 logger = get_app_logger()
@@ -22,15 +41,77 @@ async def lifespan(app: FastAPI):
     # setup_logging()
     logger.info("🚀 Приложение запускается")
 
+    market_data_cache.load()
+    await token_revocation.start(create_revocation_backend())
+
+    background = []
+    if settings.LOAD_SHED_ENABLED:
+        background.append(asyncio.create_task(admission_controller.run_forever()))
+    background.append(asyncio.create_task(run_periodically(
+        "refresh_tokens",
+        lambda: purge_refresh_tokens(async_session_maker),
+        settings.MAINTENANCE_INTERVAL,
+    )))
+    background.append(asyncio.create_task(run_periodically("exports", purge_exports, settings.MAINTENANCE_INTERVAL)))
+    if settings.JOBS_INPROCESS_WORKER:
+        worker = JobWorker(
+            async_session_maker,
+            concurrency=settings.JOBS_CONCURRENCY,
+            batch_size=settings.JOBS_BATCH_SIZE,
+            poll_interval=settings.JOBS_POLL_INTERVAL,
+            stale_after=settings.JOBS_STALE_AFTER,
+        )
+        background.append(asyncio.create_task(worker.run_forever()))
+
+    if settings.LEADERBOARD_ENABLED:
+        background.append(asyncio.create_task(strategy_leaderboard.run_forever(
+            async_session_maker,
+            interval=settings.LEADERBOARD_REFRESH_INTERVAL,
+            rebuild_interval=settings.LEADERBOARD_REBUILD_INTERVAL,
+        )))
+
+    broker_http = None
+    if settings.BROKER_SYNC_ENABLED:
+        broker_http = create_http_client()
+        scheduler = BrokerSyncScheduler(
+            async_session_maker,
+            broker_http,
+            create_broker_clients(),
+            interval=settings.BROKER_SYNC_INTERVAL,
+            concurrency=settings.BROKER_SYNC_CONCURRENCY,
+        )
+        background.append(asyncio.create_task(scheduler.run_forever()))
+
     yield
 
     # Shutdown
     logger.info("🛑 Приложение останавливается")
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    if broker_http is not None:
+        await broker_http.aclose()
+    market_data_cache.flush()
+    await token_revocation.stop()
 
 
-app = FastAPI(lifespan=lifespan, title="API for Forward Trading service", root_path="/api")
+app = FastAPI(
+    lifespan=lifespan,
+    title="API for Forward Trading service",
+    root_path="/api",
+    default_response_class=ProfiledJSONResponse,
+)
 
 app.include_router(router_auth)
+app.include_router(router_market)
+app.include_router(router_strategies)
+app.include_router(router_trading)
+app.include_router(router_admin)
+app.include_router(router_health)
+
+if settings.LOAD_SHED_ENABLED:
+    # Добавляется до CORS, чтобы ответы 503 тоже получали CORS-заголовки
+    app.add_middleware(LoadSheddingMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +120,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware)
+
+install_sqlalchemy_hooks(engine)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", reload=True)
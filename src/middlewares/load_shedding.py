@@ -0,0 +1,72 @@
+import json
+
+from src.config import settings
+from src.users_db import engine
+from src.utils.admission import AdmissionController
+
+# Маршруты, которые можно отклонить при перегрузке. Вход, check-auth и refresh обслуживаются всегда
+LOW_PRIORITY_ROUTES = {
+    ("POST", "/v1/auth/register"),
+    ("POST", "/v1/auth/password-reset/request"),
+    ("GET", "/v1/trading/deals/export"),
+}
+
+# Проверки готовности не учитываются в числе запросов в обработке
+UNCOUNTED_PREFIX = "/v1/health/"
+
+admission_controller = AdmissionController(
+    pool_checkedout=engine.sync_engine.pool.checkedout,
+    pool_capacity=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+    max_lag=settings.LOAD_SHED_MAX_LAG,
+    max_inflight=settings.LOAD_SHED_MAX_INFLIGHT,
+    max_pool_usage=settings.LOAD_SHED_MAX_POOL_USAGE,
+    cooldown=settings.LOAD_SHED_COOLDOWN,
+)
+
+OVERLOADED_BODY = json.dumps({"detail": "Сервис перегружен, повторите запрос позже"}, ensure_ascii=False).encode()
+
+
+def route_path(scope) -> str:
+    path, root_path = scope["path"], scope.get("root_path", "")
+    return path[len(root_path):] if root_path and path.startswith(root_path) else path
+
+
+class LoadSheddingMiddleware:
+    """
+    Считает запросы в обработке и при перегрузке воркера отвечает 503 с Retry-After
+    на маршруты из LOW_PRIORITY_ROUTES, не доходя до приложения
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = route_path(scope)
+        if path.startswith(UNCOUNTED_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        if (scope["method"], path.rstrip("/")) in LOW_PRIORITY_ROUTES and controller.overloaded():
+            controller.shed += 1
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(OVERLOADED_BODY)).encode()),
+                    (b"retry-after", str(controller.retry_after()).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": OVERLOADED_BODY})
+            return
+
+        controller.inflight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.inflight -= 1
@@ -0,0 +1,75 @@
+import asyncio
+import random
+import secrets
+
+from fastapi.responses import JSONResponse
+
+from src.config import settings
+from src.utils.logger import get_app_logger
+from src.utils.profiling import (
+    RequestProfile, StackSampler, ProfileStore, activate_profile, deactivate_profile, profile_phase,
+)
+
+logger = get_app_logger()
+
+PROFILE_HEADER = b"x-profile"
+
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_FILES)
+stack_sampler = StackSampler(settings.PROFILING_INTERVAL)
+
+
+class ProfiledJSONResponse(JSONResponse):
+    """JSONResponse, время сериализации которого попадает в фазу serialization"""
+
+    def render(self, content) -> bytes:
+        with profile_phase("serialization"):
+            return super().render(content)
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует отдельный запрос, если передан заголовок X-Profile с PROFILING_TOKEN
+    или запрос попал в выборку PROFILING_SAMPLE_RATE. Остальные запросы проходят без накладных расходов.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.token = settings.PROFILING_TOKEN.encode()
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+
+    def _triggered(self, scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return secrets.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        status = None
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", []).append((b"x-profile-id", profile.id.encode()))
+            await send(message)
+
+        token = activate_profile(profile)
+        stack_sampler.attach(profile)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            stack_sampler.detach(profile)
+            deactivate_profile(token)
+            profile.finish(status)
+            try:
+                await asyncio.to_thread(profile_store.save, profile)
+            except OSError as e:
+                logger.error(f"Profile save error: {e}")
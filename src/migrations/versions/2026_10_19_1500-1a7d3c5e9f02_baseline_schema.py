@@ -0,0 +1,111 @@
+"""baseline schema
+
+Revision ID: 1a7d3c5e9f02
+Revises:
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1a7d3c5e9f02"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Столбцы accounts для автоследования и синхронизации сделок. server_default нужен,
+# чтобы NOT NULL столбцы добавлялись в таблицу с уже существующими строками
+def account_columns() -> list[sa.Column]:
+    return [
+        sa.Column("broker", sa.String(length=50), nullable=False, server_default="icmarkets"),
+        sa.Column("autofollow", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("lot_multiplier", sa.Float(), nullable=False, server_default="1.0"),
+        sa.Column("max_drawdown", sa.Float(), nullable=False, server_default="0.3"),
+        sa.Column("max_lot", sa.Float(), nullable=True),
+        sa.Column("balance", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("equity", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("peak_equity", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("sync_cursor", sa.String(length=100), nullable=True),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _existing() -> tuple[set[str], set[str]]:
+    """
+    Таблицы и столбцы accounts, которые уже есть в БД. Схема до Alembic создавалась
+    вручную, поэтому baseline создаёт только недостающее. В offline-режиме БД пустая
+    """
+    if context.is_offline_mode():
+        return set(), set()
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    columns = {column["name"] for column in inspector.get_columns("accounts")} if "accounts" in tables else set()
+    return tables, columns
+
+
+def upgrade() -> None:
+    tables, existing_columns = _existing()
+
+    if "users" not in tables:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("login", sa.String(length=200), nullable=False, unique=True),
+            sa.Column("email", sa.String(length=100), nullable=False, unique=True),
+            sa.Column("email_verified", sa.Boolean(), nullable=False),
+            sa.Column("hashed_password", sa.String(length=200), nullable=False),
+        )
+
+    if "accounts" not in tables:
+        op.create_table(
+            "accounts",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("account", sa.String(length=200), nullable=False, unique=True),
+            sa.Column("type", sa.String(length=100), nullable=False),
+            *account_columns(),
+        )
+    else:
+        for column in account_columns():
+            if column.name not in existing_columns:
+                op.add_column("accounts", column)
+
+    if "deals" not in tables:
+        op.create_table(
+            "deals",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id"), nullable=False),
+            sa.Column("ticket", sa.String(length=100), nullable=False),
+            sa.Column("symbol", sa.String(length=50), nullable=False),
+            sa.Column("side", sa.String(length=10), nullable=False),
+            sa.Column("volume", sa.Float(), nullable=False),
+            sa.Column("price", sa.Float(), nullable=False),
+            sa.Column("profit", sa.Float(), nullable=False),
+            sa.Column("commission", sa.Float(), nullable=False),
+            sa.Column("swap", sa.Float(), nullable=False),
+            sa.Column("time", sa.DateTime(timezone=True), nullable=False),
+            sa.UniqueConstraint("account_id", "ticket", name="uq_deals_account_ticket"),
+        )
+        op.create_index("ix_deals_account_time", "deals", ["account_id", "time"])
+
+    if "revoked_tokens" not in tables:
+        op.create_table(
+            "revoked_tokens",
+            sa.Column("jti", sa.String(length=64), primary_key=True),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_revoked_tokens_expires_at", table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
+    op.drop_index("ix_deals_account_time", table_name="deals")
+    op.drop_table("deals")
+    for column in reversed(account_columns()):
+        op.drop_column("accounts", column.name)
+    # users и accounts существовали до Alembic и при откате не удаляются
@@ -0,0 +1,66 @@
+"""case-insensitive user lookups
+
+Revision ID: 4f1c2a9e7b3d
+Revises: 7e4b2d9c6f13
+Create Date: 2026-10-19 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f1c2a9e7b3d"
+down_revision: Union[str, Sequence[str], None] = "7e4b2d9c6f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+BACKFILL_EMAILS = sa.text(
+    "UPDATE users SET email = lower(email) "
+    "WHERE id IN (SELECT id FROM users WHERE email <> lower(email) LIMIT :batch_size)"
+)
+
+
+def _check_duplicates(column: str) -> None:
+    """Уникальный индекс по lower() не построится, если есть значения, различающиеся только регистром"""
+    if context.is_offline_mode():
+        return
+    duplicates = op.get_bind().execute(sa.text(
+        f"SELECT lower({column}) FROM users GROUP BY lower({column}) HAVING count(*) > 1 LIMIT 10"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"users.{column}: значения, различающиеся только регистром, нужно объединить вручную: {duplicates}"
+        )
+
+
+def upgrade() -> None:
+    _check_duplicates("email")
+    _check_duplicates("login")
+
+    # Вне транзакции: короткие пачки обновлений и CREATE INDEX CONCURRENTLY не блокируют запись в users
+    with op.get_context().autocommit_block():
+        if context.is_offline_mode():
+            op.execute(BACKFILL_EMAILS.bindparams(batch_size=2**31 - 1))
+        else:
+            while op.get_bind().execute(BACKFILL_EMAILS, {"batch_size": BATCH_SIZE}).rowcount:
+                pass
+
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_users_email_lower "
+            "ON users (lower(email)) INCLUDE (email)"
+        )
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_users_login_lower "
+            "ON users (lower(login)) INCLUDE (login)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_users_login_lower")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_users_email_lower")
@@ -0,0 +1,27 @@
+"""accounts strategy
+
+Revision ID: 9b2e6d4c1a85
+Revises: 4f1c2a9e7b3d
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2e6d4c1a85"
+down_revision: Union[str, Sequence[str], None] = "4f1c2a9e7b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable-столбец без значения по умолчанию добавляется без перезаписи таблицы
+    op.add_column("accounts", sa.Column("strategy", sa.String(length=50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("accounts", "strategy")
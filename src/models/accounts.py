@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Boolean, Float, DateTime
 
 from src.users_db import Base
 
@@ -11,3 +13,20 @@ class AccountsOrm(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     account: Mapped[str] = mapped_column(String(200), nullable=False, unique=True)
     type: Mapped[str] = mapped_column(String(100), unique=False, nullable=False)
+    broker: Mapped[str] = mapped_column(String(50), default="icmarkets")
+
+    # Параметры автоследования (README, шаг 4)
+    autofollow: Mapped[bool] = mapped_column(Boolean, default=False)
+    lot_multiplier: Mapped[float] = mapped_column(Float, default=1.0)
+    max_drawdown: Mapped[float] = mapped_column(Float, default=0.3)  # доля от пикового equity
+    max_lot: Mapped[float | None] = mapped_column(Float, nullable=True)
+    strategy: Mapped[str | None] = mapped_column(String(50), nullable=True)  # conservative / aggressive
+
+    # Состояние счёта: пишет BrokerSyncScheduler после сделок, peak_equity - максимум equity (update_state)
+    balance: Mapped[float] = mapped_column(Float, default=0.0)
+    equity: Mapped[float] = mapped_column(Float, default=0.0)
+    peak_equity: Mapped[float] = mapped_column(Float, default=0.0)
+
+    # Курсор инкрементальной синхронизации сделок (последняя полученная сделка)
+    sync_cursor: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
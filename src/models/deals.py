@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, ForeignKey, Float, DateTime, UniqueConstraint, Index
+
+from src.users_db import Base
+
+
+class DealsOrm(Base):
+    __tablename__ = "deals"
+    __table_args__ = (
+        UniqueConstraint("account_id", "ticket", name="uq_deals_account_ticket"),
+        Index("ix_deals_account_time", "account_id", "time"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"))
+    ticket: Mapped[str] = mapped_column(String(100), nullable=False)
+    symbol: Mapped[str] = mapped_column(String(50), nullable=False)
+    side: Mapped[str] = mapped_column(String(10), nullable=False)
+    volume: Mapped[float] = mapped_column(Float, nullable=False)
+    price: Mapped[float] = mapped_column(Float, nullable=False)
+    profit: Mapped[float] = mapped_column(Float, default=0.0)
+    commission: Mapped[float] = mapped_column(Float, default=0.0)
+    swap: Mapped[float] = mapped_column(Float, default=0.0)
+    time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
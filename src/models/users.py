@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, Index, func
 
 from src.users_db import Base
 
@@ -12,3 +12,9 @@ class UsersOrm(Base):
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     email_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     hashed_password: Mapped[str] = mapped_column(String(200))
+
+
+# Регистронезависимый поиск по email/login. INCLUDE позволяет проверкам существования
+# обходиться index-only scan (планировщик не видит сам столбец в индексе по выражению)
+Index("uq_users_email_lower", func.lower(UsersOrm.email), unique=True, postgresql_include=["email"])
+Index("uq_users_login_lower", func.lower(UsersOrm.login), unique=True, postgresql_include=["login"])
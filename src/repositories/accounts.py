@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update, func
+
+from src.repositories.base import BaseRepository
+from src.models.accounts import AccountsOrm
+from src.schemas.accounts import Account
+
+
+class AccountsRepository(BaseRepository):
+    model = AccountsOrm
+    schema = Account
+
+    async def get_by_user(self, user_id: int) -> list[Account]:
+        return await self.get_filtered(user_id=user_id)
+
+    async def get_for_sync(self) -> list[Account]:
+        """Счета для синхронизации сделок (только необходимые колонки)"""
+        query = select(
+            self.model.id,
+            self.model.user_id,
+            self.model.account,
+            self.model.type,
+            self.model.broker,
+            self.model.sync_cursor,
+            self.model.synced_at,
+        )
+        result = await self.session.execute(query)
+        return [Account.model_validate(row, from_attributes=True) for row in result.all()]
+
+    async def get_followers(self) -> list[Account]:
+        """Счета с включённым автоследованием (для FollowerBook.from_accounts)"""
+        return await self.get_filtered(autofollow=True)
+
+    async def update_sync_cursor(self, account_id: int, cursor: str | None) -> None:
+        """Сохраняет курсор последней полученной сделки"""
+        stmt = (
+            update(self.model)
+            .where(self.model.id == account_id)
+            .values(sync_cursor=cursor, synced_at=datetime.now(timezone.utc))
+        )
+        await self.session.execute(stmt)
+
+    async def update_state(self, account_id: int, balance: float, equity: float) -> None:
+        """Сохраняет состояние счёта от брокера, peak_equity - максимум equity за всё время"""
+        stmt = (
+            update(self.model)
+            .where(self.model.id == account_id)
+            .values(balance=balance, equity=equity, peak_equity=func.greatest(self.model.peak_equity, equity))
+        )
+        await self.session.execute(stmt)
+
+    async def get_strategy_totals(self) -> dict[str, tuple[int, float]]:
+        """Число последователей и суммарный equity (AUM) по стратегиям"""
+        query = (
+            select(self.model.strategy, func.count(), func.coalesce(func.sum(self.model.equity), 0.0))
+            .where(self.model.autofollow.is_(True), self.model.strategy.is_not(None))
+            .group_by(self.model.strategy)
+        )
+        result = await self.session.execute(query)
+        return {strategy: (followers, float(aum)) for strategy, followers, aum in result.all()}
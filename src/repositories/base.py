@@ -6,6 +6,7 @@ from sqlalchemy.exc import IntegrityError, NoResultFound
 
 from src.users_db import engine
 from src.utils.logger import get_user_repo_logger
+from src.utils.repo_cache import RepositoryCache
 
 logger = get_user_repo_logger()
 
@@ -13,9 +14,42 @@ logger = get_user_repo_logger()
 class BaseRepository:
     model = None
     schema: BaseModel = None
+    cache: RepositoryCache | None = None  # Кэш чтения, включается в наследнике
+    cache_tag_fields: tuple[str, ...] = ("id",)  # Поля, по которым инвалидируются записи кэша
 
     def __init__(self, session):
         self.session = session
+        self._pending_invalidations: list[dict] = []
+
+    def _cache_tags(self, value: BaseModel) -> list[tuple]:
+        return [(name, getattr(value, name)) for name in self.cache_tag_fields]
+
+    async def _cached(self, key: tuple, loader):
+        if self.cache is None:
+            return await loader()
+        return await self.cache.get_or_load(key, loader, self._cache_tags)
+
+    def _drop_cached(self, filter_by: dict) -> None:
+        tags = [(name, value) for name, value in filter_by.items() if name in self.cache_tag_fields]
+        if tags:
+            self.cache.invalidate(*tags)
+        else:
+            self.cache.clear()
+
+    def _invalidate(self, **filter_by) -> None:
+        """
+        Сбрасывает записи кэша, затронутые изменением строк по filter_by.
+        Повторяется после commit: читатель мог успеть закэшировать ещё не изменённую строку.
+        """
+        if self.cache is None:
+            return
+        self._drop_cached(filter_by)
+        self._pending_invalidations.append(filter_by)
+
+    def after_commit(self) -> None:
+        pending, self._pending_invalidations = self._pending_invalidations, []
+        for filter_by in pending:
+            self._drop_cached(filter_by)
 
     async def get_filtered(self, **filter_by):
         query = select(self.model).filter_by(**filter_by)
@@ -26,18 +60,25 @@ class BaseRepository:
         return await self.get_filtered()
 
     async def get_one_or_none(self, **filter_by):
-        query = select(self.model).filter_by(**filter_by)
-        result = await self.session.execute(query)
-        model = result.scalars().one_or_none()
-        if model is None:
+        async def load():
+            query = select(self.model).filter_by(**filter_by)
+            result = await self.session.execute(query)
+            model = result.scalars().one_or_none()
+            return None if model is None else self.schema.model_validate(model, from_attributes=True)
+
+        data = await self._cached(("one", tuple(sorted(filter_by.items()))), load)
+        if data is None:
             raise NoResultFound
-        return self.schema.model_validate(model, from_attributes=True)
+        return data
 
     async def get_data_by_id(self, data_id: int):
-        query = select(self.model).filter_by(id=data_id)
-        result = await self.session.execute(query)
-        model = result.scalars().one()
-        return self.schema.model_validate(model, from_attributes=True)
+        async def load():
+            query = select(self.model).filter_by(id=data_id)
+            result = await self.session.execute(query)
+            model = result.scalars().one()
+            return self.schema.model_validate(model, from_attributes=True)
+
+        return await self._cached(("one", (("id", data_id),)), load)
 
     async def add(self, data: BaseModel):
         add_data_stmt = (
@@ -68,8 +109,10 @@ class BaseRepository:
             raise
         logger.info(update_data_stmt.compile(engine, compile_kwargs={"literal_binds": True}))
         await self.session.execute(update_data_stmt)
+        self._invalidate(**filter_by)
 
     async def delete(self, **filter_by):
         delete_data_stmt = delete(self.model).filter_by(**filter_by)
         logger.info(delete_data_stmt.compile(engine, compile_kwargs={"literal_binds": True}))
         await self.session.execute(delete_data_stmt)
+        self._invalidate(**filter_by)
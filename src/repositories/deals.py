@@ -0,0 +1,103 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+
+from sqlalchemy import select, func, cast, Date, literal_column
+from sqlalchemy.dialects.postgresql import insert
+
+from src.repositories.base import BaseRepository
+from src.models.accounts import AccountsOrm
+from src.models.deals import DealsOrm
+from src.schemas.deals import Deal, DealAdd
+
+
+class DealsRepository(BaseRepository):
+    model = DealsOrm
+    schema = Deal
+
+    # 10 параметров на строку: пачка укладывается в лимит asyncpg (32767 параметров на запрос)
+    MAX_INSERT_ROWS = 3000
+
+    async def add_bulk(self, deals: list[DealAdd]) -> None:
+        """Пакетная вставка сделок. Уже сохранённые сделки (account_id, ticket) пропускаются"""
+        for offset in range(0, len(deals), self.MAX_INSERT_ROWS):
+            stmt = (
+                insert(self.model)
+                .values([deal.model_dump() for deal in deals[offset:offset + self.MAX_INSERT_ROWS]])
+                .on_conflict_do_nothing(constraint="uq_deals_account_ticket")
+            )
+            await self.session.execute(stmt)
+
+    async def get_max_id(self) -> int:
+        result = await self.session.execute(select(func.coalesce(func.max(self.model.id), 0)))
+        return result.scalar()
+
+    async def get_strategy_daily_pnl(
+            self, after_id: int, up_to_id: int, since: datetime
+    ) -> list[tuple[str, date, float]]:
+        """
+        Результат сделок с id в (after_id, up_to_id] по стратегиям и дням (UTC),
+        только для счетов с включённым автоследованием
+        """
+        # Литерал, а не параметр: выражение в SELECT и GROUP BY должно совпадать текстуально
+        trade_day = cast(func.timezone(literal_column("'UTC'"), self.model.time), Date)
+        query = (
+            select(
+                AccountsOrm.strategy,
+                trade_day,
+                func.sum(self.model.profit + self.model.commission + self.model.swap),
+            )
+            .join(AccountsOrm, AccountsOrm.id == self.model.account_id)
+            .where(
+                self.model.id > after_id,
+                self.model.id <= up_to_id,
+                self.model.time >= since,
+                AccountsOrm.autofollow.is_(True),
+                AccountsOrm.strategy.is_not(None),
+            )
+            .group_by(AccountsOrm.strategy, trade_day)
+        )
+        result = await self.session.execute(query)
+        return [(strategy, day, float(pnl)) for strategy, day, pnl in result.all()]
+
+    def _export_filter(self, user_id: int, start: datetime | None, end: datetime | None) -> list:
+        """Фильтр по счетам пользователя и периоду [start, end) - диапазон по индексу ix_deals_account_time"""
+        accounts = select(AccountsOrm.id).where(AccountsOrm.user_id == user_id)
+        conditions = [self.model.account_id.in_(accounts)]
+        if start is not None:
+            conditions.append(self.model.time >= start)
+        if end is not None:
+            conditions.append(self.model.time < end)
+        return conditions
+
+    async def count_for_export(self, user_id: int, start: datetime | None, end: datetime | None) -> int:
+        query = select(func.count()).select_from(self.model).where(*self._export_filter(user_id, start, end))
+        return (await self.session.execute(query)).scalar()
+
+    async def stream_for_export(
+            self, user_id: int, start: datetime | None, end: datetime | None, batch_size: int = 5000
+    ) -> AsyncIterator[Sequence[tuple]]:
+        """
+        Сделки пользователя пачками по batch_size строк через серверный курсор.
+        Порядок (account_id, time) совпадает с индексом - сортировка в БД не нужна.
+        """
+        query = (
+            select(
+                self.model.time,
+                AccountsOrm.account,
+                self.model.ticket,
+                self.model.symbol,
+                self.model.side,
+                self.model.volume,
+                self.model.price,
+                self.model.commission,
+                self.model.swap,
+                self.model.profit,
+            )
+            .join(AccountsOrm, AccountsOrm.id == self.model.account_id)
+            .where(*self._export_filter(user_id, start, end))
+            .order_by(self.model.account_id, self.model.time)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            yield partition
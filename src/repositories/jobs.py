@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, insert, update, delete, func, case
+
+from src.repositories.base import BaseRepository
+from src.models.jobs import JobsOrm
+from src.schemas.jobs import Job, JobAdd
+
+
+class JobsRepository(BaseRepository):
+    model = JobsOrm
+    schema = Job
+
+    async def enqueue(self, kind: str, payload: dict, max_attempts: int = 5) -> Job:
+        """Добавляет задачу в текущей транзакции - она появится в очереди вместе с commit"""
+        # Без логирования SQL, как в add(): payload содержит токены из писем
+        stmt = (
+            insert(self.model)
+            .values(**JobAdd(kind=kind, payload=payload, max_attempts=max_attempts).model_dump())
+            .returning(self.model)
+        )
+        result = await self.session.execute(stmt)
+        return self.schema.model_validate(result.scalars().one())
+
+    async def claim_batch(self, limit: int) -> list[Job]:
+        """Забирает готовые задачи. SKIP LOCKED позволяет нескольким воркерам не мешать друг другу"""
+        ready = (
+            select(self.model.id)
+            .where(self.model.status == "pending", self.model.run_at <= func.now())
+            .order_by(self.model.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(ready))
+            .values(status="running", locked_at=func.now(), attempts=self.model.attempts + 1)
+            .returning(self.model)
+        )
+        result = await self.session.execute(stmt)
+        return [self.schema.model_validate(model) for model in result.scalars().all()]
+
+    async def complete(self, job_id: int) -> None:
+        await self.session.execute(delete(self.model).where(self.model.id == job_id))
+
+    async def fail(self, job: Job, error: str, retry_in: float | None) -> None:
+        """Повтор через retry_in секунд или перевод в dead, если retry_in is None"""
+        values = {"last_error": error[:2000], "locked_at": None}
+        if retry_in is None:
+            values["status"] = "dead"
+        else:
+            values["status"] = "pending"
+            values["run_at"] = datetime.now(timezone.utc) + timedelta(seconds=retry_in)
+        await self.session.execute(update(self.model).where(self.model.id == job.id).values(**values))
+
+    async def heartbeat(self, job_id: int) -> None:
+        """Отметка выполнения: задача с недавним locked_at не считается зависшей"""
+        stmt = (
+            update(self.model)
+            .where(self.model.id == job_id, self.model.status == "running")
+            .values(locked_at=func.now())
+        )
+        await self.session.execute(stmt)
+
+    async def requeue_stale(self, timeout: float) -> tuple[int, int]:
+        """
+        Задачи, зависшие в running (воркер упал во время выполнения), возвращаются в очередь.
+        Если попытки исчерпаны - переводятся в dead, чтобы задача, роняющая воркер, не повторялась вечно.
+        Возвращает (возвращено в очередь, переведено в dead)
+        """
+        exhausted = self.model.attempts >= self.model.max_attempts
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.status == "running",
+                self.model.locked_at < datetime.now(timezone.utc) - timedelta(seconds=timeout),
+            )
+            .values(
+                status=case((exhausted, "dead"), else_="pending"),
+                locked_at=None,
+                last_error=f"Нет отметки выполнения дольше {timeout:.0f} с (воркер остановлен?)",
+            )
+            .returning(self.model.status)
+        )
+        statuses = (await self.session.execute(stmt)).scalars().all()
+        dead = statuses.count("dead")
+        return len(statuses) - dead, dead
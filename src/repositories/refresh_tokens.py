@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update, delete, or_
+
+from src.repositories.base import BaseRepository
+from src.models.refresh_tokens import RefreshTokensOrm
+from src.models.users import UsersOrm
+from src.schemas.refresh_tokens import RefreshToken
+from src.schemas.users import User
+
+
+class RefreshTokensRepository(BaseRepository):
+    model = RefreshTokensOrm
+    schema = RefreshToken
+
+    async def get_with_user(self, token_hash: str) -> tuple[RefreshToken, User] | None:
+        """Запись refresh-токена и его владелец одним запросом по уникальному индексу"""
+        query = (
+            select(self.model, UsersOrm)
+            .join(UsersOrm, UsersOrm.id == self.model.user_id)
+            .where(self.model.token_hash == token_hash)
+        )
+        row = (await self.session.execute(query)).first()
+        if row is None:
+            return None
+        token, user = row
+        return (
+            RefreshToken.model_validate(token, from_attributes=True),
+            User.model_validate(user, from_attributes=True),
+        )
+
+    async def revoke(self, token_id: int) -> bool:
+        """Отзывает токен. False - токен уже был отозван (в том числе параллельным запросом)"""
+        stmt = (
+            update(self.model)
+            .where(self.model.id == token_id, self.model.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+            .returning(self.model.id)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none() is not None
+
+    async def revoke_family(self, family_id: str) -> None:
+        """Отзывает всю цепочку ротаций (выход или обнаружение повторного использования)"""
+        stmt = (
+            update(self.model)
+            .where(self.model.family_id == family_id, self.model.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+        await self.session.execute(stmt)
+
+    async def purge(self, revoked_before: datetime) -> int:
+        """Удаляет истёкшие токены и токены, отозванные раньше revoked_before"""
+        stmt = delete(self.model).where(or_(
+            self.model.expires_at <= datetime.now(timezone.utc),
+            self.model.revoked_at < revoked_before,
+        ))
+        return (await self.session.execute(stmt)).rowcount
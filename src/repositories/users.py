@@ -1,10 +1,12 @@
-from sqlalchemy import select, exists, update
+from sqlalchemy import select, exists, update, func
 
+from src.config import settings
 from src.repositories.base import BaseRepository
 from src.models.users import UsersOrm
 from src.schemas.users import User, UserWithHashedPassword
 
 from src.utils.logger import get_user_repo_logger
+from src.utils.repo_cache import RepositoryCache
 
 logger = get_user_repo_logger()
 
@@ -12,9 +14,33 @@ logger = get_user_repo_logger()
 class UsersRepository(BaseRepository):
     model = UsersOrm
     schema = User
+    cache = (
+        RepositoryCache(maxsize=settings.REPO_CACHE_SIZE, ttl=settings.REPO_CACHE_TTL)
+        if settings.REPO_CACHE_ENABLED else None
+    )
+    cache_tag_fields = ("id", "email", "login")
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """Ключ кеша. В SQL регистр приводится функцией lower() Postgres (см. email_matches)"""
+        return value.strip().lower()
+
+    @classmethod
+    def email_matches(cls, email: str):
+        """
+        Условие по функциональному индексу uq_users_email_lower.
+        Обе стороны приводятся lower() Postgres: str.lower() расходится с ним для
+        не-ASCII символов (кириллица) при LC_CTYPE C/POSIX
+        """
+        return func.lower(cls.model.email) == func.lower(email.strip())
+
+    @classmethod
+    def login_matches(cls, login: str):
+        """Условие по функциональному индексу uq_users_login_lower (регистр - как в email_matches)"""
+        return func.lower(cls.model.login) == func.lower(login.strip())
 
     async def get_user_with_hashed_password(self, login: str):
-        query = select(self.model).filter_by(login=login)
+        query = select(self.model).where(self.login_matches(login))
         result = await self.session.execute(query)
         model = result.scalars().first()
 
@@ -27,24 +53,29 @@ class UsersRepository(BaseRepository):
         """Обновляет статус подтверждения email"""
         stmt = (
             update(self.model)
-            .where(self.model.email == email)
+            .where(self.email_matches(email))
             .values(email_verified=True)
         )
         await self.session.execute(stmt)
+        self._invalidate(email=self.normalize(email))
 
     async def email_exists(self, email: str) -> bool:
-        query = select(exists().where(self.model.email == email))
+        query = select(exists().where(self.email_matches(email)))
         return (await self.session.execute(query)).scalar()
 
     async def login_exists(self, login: str) -> bool:
-        query = select(exists().where(self.model.login == login))
+        query = select(exists().where(self.login_matches(login)))
         return (await self.session.execute(query)).scalar()
 
-    async def get_by_email(self, email: str):
-        """Поиск пользователя по email (возвращает ORM-объект)"""
-        stmt = select(self.model).where(self.model.email == email)
-        result = await self.session.execute(stmt)
-        return result.scalars().first()
+    async def get_by_email(self, email: str) -> User | None:
+        """Поиск пользователя по email (без учёта регистра)"""
+        async def load():
+            stmt = select(self.model).where(self.email_matches(email))
+            result = await self.session.execute(stmt)
+            model = result.scalars().first()
+            return None if model is None else User.model_validate(model, from_attributes=True)
+
+        return await self._cached(("email", self.normalize(email)), load)
 
     async def update_password(self, user_id: int, new_hashed_password: str) -> None:
         """Обновление пароля в БД"""
@@ -54,3 +85,4 @@ class UsersRepository(BaseRepository):
             .values(hashed_password=new_hashed_password)
         )
         await self.session.execute(stmt)
+        self._invalidate(id=user_id)
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class Account(BaseModel):
+    id: int = Field(description="Идентификатор счёта")
+    user_id: int = Field(description="Идентификатор владельца")
+    account: str = Field(description="Номер счёта у брокера")
+    type: str = Field(description="Тип счёта (demo/real)")
+    broker: str = Field(description="Брокер")
+    strategy: str | None = Field(None, description="Выбранная стратегия ИИ")
+    autofollow: bool = Field(False, description="Автоследование за стратегией включено")
+    lot_multiplier: float = Field(1.0, description="Множитель лотности")
+    max_drawdown: float = Field(0.3, description="Максимальная просадка, доля от пикового equity (<= 0 - копирование остановлено)")
+    max_lot: float | None = Field(None, description="Максимальный объём ордера (None - без ограничения)")
+    balance: float = Field(0.0, description="Баланс")
+    equity: float = Field(0.0, description="Equity")
+    peak_equity: float = Field(0.0, description="Пиковое equity")
+    sync_cursor: str | None = Field(None, description="Последняя синхронизированная сделка")
+    synced_at: datetime | None = Field(None, description="Время последней синхронизации")
+
+    model_config = ConfigDict(from_attributes=True)
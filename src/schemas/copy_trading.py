@@ -0,0 +1,23 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class TradeSignal(BaseModel):
+    symbol: str = Field(description="Торговый инструмент")
+    side: Literal["buy", "sell"] = Field(description="Направление сделки")
+    volume: float = Field(gt=0, description="Объём сделки на сигнальном счёте (лоты)")
+    master_balance: float = Field(gt=0, description="Баланс сигнального счёта")
+
+
+class BrokerLimits(BaseModel):
+    min_lot: float = Field(0.01, gt=0, description="Минимальный объём ордера")
+    max_lot: float = Field(100.0, gt=0, description="Максимальный объём ордера")
+    lot_step: float = Field(0.01, gt=0, description="Шаг изменения объёма")
+
+
+class CopyOrder(BaseModel):
+    account_id: int = Field(description="Идентификатор счёта последователя")
+    symbol: str = Field(description="Торговый инструмент")
+    side: Literal["buy", "sell"] = Field(description="Направление сделки")
+    volume: float = Field(description="Объём ордера (лоты)")
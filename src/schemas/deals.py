@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class DealAdd(BaseModel):
+    account_id: int = Field(description="Идентификатор счёта")
+    ticket: str = Field(description="Номер сделки у брокера")
+    symbol: str = Field(description="Торговый инструмент")
+    side: str = Field(description="Направление сделки")
+    volume: float = Field(description="Объём (лоты)")
+    price: float = Field(description="Цена исполнения")
+    profit: float = Field(0.0, description="Прибыль/убыток")
+    commission: float = Field(0.0, description="Комиссия")
+    swap: float = Field(0.0, description="Своп")
+    time: datetime = Field(description="Время исполнения")
+
+
+class Deal(DealAdd):
+    id: int = Field(description="Идентификатор записи")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DealsExportQueued(BaseModel):
+    export_id: str = Field(description="Идентификатор выгрузки")
+    download_url: str = Field(description="Ссылка на файл (404, пока файл не готов)")
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobAdd(BaseModel):
+    kind: str = Field(description="Тип задачи (имя обработчика)")
+    payload: dict = Field(description="Аргументы обработчика")
+    max_attempts: int = Field(5, description="Максимальное количество попыток")
+
+
+class Job(JobAdd):
+    id: int = Field(description="Идентификатор задачи")
+    status: str = Field(description="pending / running / dead")
+    attempts: int = Field(description="Выполненные попытки")
+    last_error: str | None = Field(None, description="Ошибка последней попытки")
+    run_at: datetime = Field(description="Время, не раньше которого задача будет выполнена")
+
+    model_config = ConfigDict(from_attributes=True)
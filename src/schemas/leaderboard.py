@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class StrategyStats(BaseModel):
+    strategy: str = Field(description="Стратегия ИИ")
+    rank: int = Field(description="Место в рейтинге (по доходности, затем по результату сделок за 30 дней)")
+    followers: int = Field(description="Счетов с включённым автоследованием")
+    aum: float = Field(description="Суммарный equity счетов последователей")
+    pnl_30d: float = Field(description="Результат сделок за 30 дней")
+    return_7d: float = Field(description="Доходность за 7 дней (доля)")
+    return_30d: float = Field(description="Доходность за 30 дней (доля)")
+    max_drawdown_30d: float = Field(description="Максимальная просадка за 30 дней (доля от пика)")
+
+
+class LeaderboardResponse(BaseModel):
+    generated_at: datetime = Field(description="Время расчёта рейтинга")
+    strategies: list[StrategyStats]
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class CandlesResponse(BaseModel):
+    symbol: str = Field(description="Торговый инструмент")
+    timeframe: str = Field(description="Таймфрейм")
+    time: list[int] = Field(description="Время открытия баров (unix, секунды)")
+    open: list[float]
+    high: list[float]
+    low: list[float]
+    close: list[float]
+    volume: list[float]
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RefreshTokenAdd(BaseModel):
+    user_id: int = Field(description="Идентификатор пользователя")
+    token_hash: str = Field(description="SHA-256 refresh-токена")
+    family_id: str = Field(description="Идентификатор цепочки ротаций")
+    expires_at: datetime = Field(description="Время истечения")
+
+
+class RefreshToken(RefreshTokenAdd):
+    id: int = Field(description="Идентификатор записи")
+    revoked_at: datetime | None = Field(None, description="Время отзыва (ротации)")
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,55 @@
+import asyncio
+import hashlib
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from src.config import settings
+
+
+class AdvisorFile:
+    __slots__ = ("path", "size", "mtime_ns", "etag")
+
+    def __init__(self, path: Path, size: int, mtime_ns: int, etag: str):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.etag = etag
+
+
+class AdvisorService:
+    """Метаданные файла советника. Хеш содержимого считается один раз на версию файла"""
+    _cached: AdvisorFile | None = None
+
+    @staticmethod
+    def _sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    async def get_file(cls) -> AdvisorFile:
+        path = Path(settings.ADVISOR_PATH)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Файл советника не найден")
+
+        cached = cls._cached
+        if cached and cached.path == path and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+            return cached
+
+        digest = await asyncio.to_thread(cls._sha256, path)
+        cls._cached = AdvisorFile(path, stat.st_size, stat.st_mtime_ns, f'"{digest}"')
+        return cls._cached
+
+    @staticmethod
+    def etag_matches(if_none_match: str | None, etag: str) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return etag in candidates
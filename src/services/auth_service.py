@@ -1,3 +1,6 @@
+import hashlib
+import secrets
+import uuid
 from datetime import datetime, timezone, timedelta
 
 from fastapi import HTTPException
@@ -6,30 +9,60 @@ import jwt
 
 # from src.api.dependencies import DBDep
 from src.config import settings
+from src.utils.profiling import profile_phase
 
 
 class AuthService:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    # min/max совпадают с целевой стоимостью: хеши с другой стоимостью пересчитываются при входе
+    pwd_context = CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+    )
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
+    REFRESH_TOKEN_EXPIRE_DAYS = 30
+    # Токен, ротированный не раньше стольких секунд назад, - параллельное обновление из другой вкладки
+    REFRESH_REUSE_GRACE_SECONDS = 10
+    # Отозванные записи хранятся для обнаружения повторного использования, затем удаляются
+    REFRESH_REVOKED_RETENTION_DAYS = 7
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return AuthService.pwd_context.verify(plain_password, hashed_password)
+        with profile_phase("bcrypt"):
+            return AuthService.pwd_context.verify(plain_password, hashed_password)
 
     @staticmethod
     def hash_password(password: str) -> str:
-        return AuthService.pwd_context.hash(password)
+        with profile_phase("bcrypt"):
+            return AuthService.pwd_context.hash(password)
+
+    @staticmethod
+    def password_needs_rehash(hashed_password: str) -> bool:
+        return AuthService.pwd_context.needs_update(hashed_password)
 
     def create_access_token(self, user_data: dict) -> str:
         to_encode = user_data.copy()
         expire = datetime.now(timezone.utc) + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode["exp"] = expire
+        to_encode["jti"] = uuid.uuid4().hex  # Идентификатор для отзыва токена
         return jwt.encode(
             to_encode,
             settings.JWT_SECRET_KEY,
             algorithm=settings.JWT_ALGORITHM,
         )
 
+    def create_refresh_token(self) -> tuple[str, str, datetime]:
+        """Непрозрачный refresh-токен: (токен для cookie, sha256 для БД, время истечения)"""
+        token = secrets.token_urlsafe(32)
+        expire = datetime.now(timezone.utc) + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
+        return token, self.hash_refresh_token(token), expire
+
+    @staticmethod
+    def hash_refresh_token(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
     @staticmethod
     def decode_token(token: str) -> dict:
         try:
@@ -0,0 +1,281 @@
+import asyncio
+import random
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+import httpx
+
+from src.config import settings
+from src.schemas.accounts import Account
+from src.schemas.deals import DealAdd
+from src.utils.db_manager import DBManager
+from src.utils.logger import get_broker_sync_logger
+
+logger = get_broker_sync_logger()
+
+
+class BrokerClient(ABC):
+    """
+    Базовый клиент брокерского API. Отдаёт новые сделки после курсора постранично:
+    (сделки страницы, курсор после неё). Каждая страница сохраняется сразу,
+    поэтому память ограничена размером страницы, а прогресс переживает сбой.
+    """
+    name: str = None
+
+    def __init__(self, base_url: str, page_size: int = 500):
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+
+    @abstractmethod
+    def fetch_deals(
+            self, http: httpx.AsyncClient, account: Account, cursor: str | None
+    ) -> AsyncIterator[tuple[list[DealAdd], str | None]]:
+        ...
+
+    @abstractmethod
+    async def fetch_account_state(self, http: httpx.AsyncClient, account: Account) -> tuple[float, float]:
+        """Текущие (balance, equity) счёта"""
+        ...
+
+
+class ICMarketsReportClient(BrokerClient):
+    """
+    Report API: GET {base}/accounts/{account}/deals?after=<ticket>&limit=<n>
+    Ответ: {"deals": [{"ticket", "symbol", "side", "volume", "price", "profit",
+                       "commission", "swap", "time"}, ...]} в порядке возрастания ticket
+    Состояние счёта: GET {base}/accounts/{account}/summary -> {"balance", "equity", ...}
+    """
+    name = "icmarkets"
+
+    async def fetch_account_state(self, http, account):
+        response = await http.get(f"{self.base_url}/accounts/{account.account}/summary")
+        response.raise_for_status()
+        data = response.json()
+        return float(data["balance"]), float(data["equity"])
+
+    async def fetch_deals(self, http, account, cursor):
+        while True:
+            params = {"limit": self.page_size}
+            if cursor:
+                params["after"] = cursor
+            response = await http.get(f"{self.base_url}/accounts/{account.account}/deals", params=params)
+            response.raise_for_status()
+            page = response.json()["deals"]
+
+            deals = [
+                DealAdd(
+                    account_id=account.id,
+                    ticket=str(item["ticket"]),
+                    symbol=item["symbol"],
+                    side=item["side"],
+                    volume=item["volume"],
+                    price=item["price"],
+                    profit=item.get("profit", 0.0),
+                    commission=item.get("commission", 0.0),
+                    swap=item.get("swap", 0.0),
+                    time=item["time"],
+                )
+                for item in page
+            ]
+            if page:
+                cursor = str(page[-1]["ticket"])
+                yield deals, cursor
+            if len(page) < self.page_size:
+                return
+
+
+class MT5WebApiClient(BrokerClient):
+    """
+    MT5 WebAPI: GET {base}/api/deal/get_batch?login=<account>&from=<unix>&to=<unix>
+    Состояние счёта: GET {base}/api/user/account/get?login=<account> -> answer: {"Balance", "Equity", ...}
+    История запрашивается окнами по window секунд (первая синхронизация - с history_start).
+    Курсор - секунда, следующая за просмотренным интервалом: после окна со сделками - за последней
+    сделкой, в конце цикла - за концом последнего окна (даже пустого), чтобы счёт без новых сделок
+    не просматривал историю заново. Окно заканчивается на settle секунд раньше текущего времени,
+    чтобы сделки последней секунды успели появиться.
+    """
+    name = "mt5"
+    SIDES = {"0": "buy", "1": "sell"}  # Остальные Action - балансовые операции
+
+    def __init__(
+            self,
+            base_url: str,
+            page_size: int = 500,
+            window: int = 30 * 24 * 3600,
+            history_start: int = 1_262_304_000,  # 2010-01-01, запуск MT5
+            settle: int = 2,
+    ):
+        super().__init__(base_url, page_size)
+        self.window = window
+        self.history_start = history_start
+        self.settle = settle
+
+    async def _get(self, http, path: str, params: dict):
+        response = await http.get(f"{self.base_url}{path}", params=params)
+        response.raise_for_status()
+        data = response.json()
+        if not str(data.get("retcode", "")).startswith("0"):
+            raise RuntimeError(f"MT5 WebAPI error: {data.get('retcode')}")
+        return data.get("answer")
+
+    async def fetch_account_state(self, http, account):
+        answer = await self._get(http, "/api/user/account/get", {"login": account.account})
+        return float(answer["Balance"]), float(answer["Equity"])
+
+    async def _fetch_window(self, http, account, date_from: int, date_to: int) -> list[DealAdd]:
+        params = {"login": account.account, "from": date_from, "to": date_to}
+        answer = await self._get(http, "/api/deal/get_batch", params)
+
+        deals = []
+        for item in answer or []:
+            side = self.SIDES.get(str(item["Action"]))
+            if side is None:
+                continue
+            deals.append(DealAdd(
+                account_id=account.id,
+                ticket=str(item["Deal"]),
+                symbol=item["Symbol"],
+                side=side,
+                volume=int(item["Volume"]) / 10000,  # MT5 хранит объём в 1/10000 лота
+                price=float(item["Price"]),
+                profit=float(item.get("Profit", 0)),
+                commission=float(item.get("Commission", 0)),
+                swap=float(item.get("Storage", 0)),
+                time=datetime.fromtimestamp(int(item["Time"]), tz=timezone.utc),
+            ))
+        return deals
+
+    async def fetch_deals(self, http, account, cursor):
+        date_from = int(cursor) if cursor else self.history_start
+        until = int(time.time()) - self.settle
+        while date_from <= until:
+            date_to = min(date_from + self.window - 1, until)
+            deals = await self._fetch_window(http, account, date_from, date_to)
+            if deals:
+                cursor = str(int(max(deal.time for deal in deals).timestamp()) + 1)
+                for offset in range(0, len(deals), self.page_size):
+                    yield deals[offset:offset + self.page_size], cursor
+            date_from = date_to + 1
+        if cursor != str(date_from):
+            # Просмотрено до until включительно: пустые окна больше не запрашиваются
+            yield [], str(date_from)
+
+
+def create_broker_clients() -> dict[str, BrokerClient]:
+    """Клиенты брокеров, для которых задан адрес API"""
+    clients = {}
+    if settings.ICMARKETS_REPORT_URL:
+        clients[ICMarketsReportClient.name] = ICMarketsReportClient(settings.ICMARKETS_REPORT_URL)
+    if settings.MT5_WEBAPI_URL:
+        clients[MT5WebApiClient.name] = MT5WebApiClient(settings.MT5_WEBAPI_URL)
+    return clients
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Общий пул соединений для всех брокерских клиентов"""
+    return httpx.AsyncClient(
+        timeout=settings.BROKER_HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.BROKER_SYNC_CONCURRENCY * 4,
+            max_keepalive_connections=settings.BROKER_SYNC_CONCURRENCY * 2,
+        ),
+    )
+
+
+class _Backoff:
+    __slots__ = ("failures", "next_attempt")
+
+    def __init__(self):
+        self.failures = 0
+        self.next_attempt = 0.0
+
+
+class BrokerSyncScheduler:
+    """
+    Периодическая синхронизация сделок и состояния счетов по строкам AccountsOrm.
+    - Запрашиваются только сделки после сохранённого курсора счёта
+    - После сделок сохраняются balance и equity, peak_equity - максимум equity
+      (по ним CopyTradeSizer считает объёмы и просадку, а рейтинг стратегий - AUM)
+    - Параллелизм ограничен отдельно для каждого брокера
+    - Счета с ошибками откладываются с экспоненциальной задержкой
+    """
+
+    def __init__(
+            self,
+            session_factory,
+            http: httpx.AsyncClient,
+            clients: dict[str, BrokerClient],
+            interval: float = 60.0,
+            concurrency: int = 8,
+            base_backoff: float = 5.0,
+            max_backoff: float = 900.0,
+    ):
+        self.session_factory = session_factory
+        self.http = http
+        self.clients = clients
+        self.interval = interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._semaphores = {name: asyncio.Semaphore(concurrency) for name in clients}
+        self._backoff: dict[int, _Backoff] = {}
+
+    def _is_due(self, account_id: int, now: float) -> bool:
+        state = self._backoff.get(account_id)
+        return state is None or state.next_attempt <= now
+
+    def _register_failure(self, account_id: int) -> float:
+        state = self._backoff.setdefault(account_id, _Backoff())
+        state.failures += 1
+        delay = min(self.base_backoff * 2 ** (state.failures - 1), self.max_backoff)
+        delay *= random.uniform(0.8, 1.2)  # Разносим повторы во времени
+        state.next_attempt = time.monotonic() + delay
+        return delay
+
+    async def sync_account(self, account: Account) -> int:
+        """Синхронизирует один счёт, возвращает количество полученных сделок"""
+        client = self.clients[account.broker]
+        synced = 0
+        try:
+            async with self._semaphores[account.broker]:
+                async for deals, cursor in client.fetch_deals(self.http, account, account.sync_cursor):
+                    # Страница и курсор после неё сохраняются в одной транзакции
+                    async with DBManager(session_factory=self.session_factory) as db:
+                        await db.deals.add_bulk(deals)
+                        await db.accounts.update_sync_cursor(account.id, cursor)
+                        await db.commit()
+                    synced += len(deals)
+
+                balance, equity = await client.fetch_account_state(self.http, account)
+                async with DBManager(session_factory=self.session_factory) as db:
+                    await db.accounts.update_state(account.id, balance, equity)
+                    await db.commit()
+        except Exception as e:
+            delay = self._register_failure(account.id)
+            logger.warning(f"Sync failed for account {account.id} ({account.broker}): {e}. Retry in {delay:.0f}s")
+            return synced
+
+        self._backoff.pop(account.id, None)
+        return synced
+
+    async def run_cycle(self) -> int:
+        async with DBManager(session_factory=self.session_factory) as db:
+            accounts = await db.accounts.get_for_sync()
+
+        now = time.monotonic()
+        due = [a for a in accounts if a.broker in self.clients and self._is_due(a.id, now)]
+        synced = await asyncio.gather(*(self.sync_account(account) for account in due))
+        return sum(synced)
+
+    async def run_forever(self):
+        while True:
+            started = time.monotonic()
+            try:
+                synced = await self.run_cycle()
+                logger.info(f"Broker sync cycle: {synced} new deals in {time.monotonic() - started:.1f}s")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Broker sync cycle error: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
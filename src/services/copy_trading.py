@@ -0,0 +1,101 @@
+from collections.abc import Iterable
+
+import numpy as np
+
+from src.schemas.copy_trading import TradeSignal, BrokerLimits, CopyOrder
+
+
+class FollowerBook:
+    """
+    Колоночное представление счетов последователей.
+    Каждый параметр хранится отдельным массивом, чтобы расчёт объёмов
+    для всех счетов выполнялся одним векторным проходом.
+    """
+
+    def __init__(
+            self,
+            account_ids: np.ndarray,
+            balance: np.ndarray,
+            equity: np.ndarray,
+            peak_equity: np.ndarray,
+            lot_multiplier: np.ndarray,
+            max_drawdown: np.ndarray,
+            max_lot: np.ndarray,
+    ):
+        self.account_ids = np.asarray(account_ids, dtype=np.int64)
+        self.balance = np.asarray(balance, dtype=np.float64)
+        self.equity = np.asarray(equity, dtype=np.float64)
+        self.peak_equity = np.asarray(peak_equity, dtype=np.float64)
+        self.lot_multiplier = np.asarray(lot_multiplier, dtype=np.float64)
+        self.max_drawdown = np.asarray(max_drawdown, dtype=np.float64)
+        self.max_lot = np.asarray(max_lot, dtype=np.float64)  # NaN - без ограничения
+
+    def __len__(self) -> int:
+        return len(self.account_ids)
+
+    @classmethod
+    def from_accounts(cls, accounts: Iterable) -> "FollowerBook":
+        """
+        Сборка колонок из схем Account (db.accounts.get_followers()) или ORM-объектов AccountsOrm.
+        Счета без автоследования отбрасываются.
+        """
+        accounts = [a for a in accounts if a.autofollow]
+        return cls(
+            account_ids=np.fromiter((a.id for a in accounts), np.int64, len(accounts)),
+            balance=np.fromiter((a.balance for a in accounts), np.float64, len(accounts)),
+            equity=np.fromiter((a.equity for a in accounts), np.float64, len(accounts)),
+            peak_equity=np.fromiter((a.peak_equity for a in accounts), np.float64, len(accounts)),
+            lot_multiplier=np.fromiter((a.lot_multiplier for a in accounts), np.float64, len(accounts)),
+            max_drawdown=np.fromiter((a.max_drawdown for a in accounts), np.float64, len(accounts)),
+            max_lot=np.fromiter(
+                (np.nan if a.max_lot is None else a.max_lot for a in accounts), np.float64, len(accounts)
+            ),
+        )
+
+
+class CopyTradeSizer:
+    """
+    Расчёт объёмов копируемых ордеров по сигналу мастер-счёта.
+    - Объём пропорционален балансу последователя и его множителю лотности
+    - По мере приближения просадки к максимально допустимой объём линейно снижается,
+      при достижении лимита ордер не выставляется
+    - max_drawdown <= 0 означает, что копирование на счёт остановлено: ордера не выставляются
+    - Итог ограничивается лимитом счёта и лимитами брокера, округляется вниз до шага лота
+    """
+
+    def __init__(self, limits: BrokerLimits | None = None):
+        self.limits = limits or BrokerLimits()
+
+    def compute_volumes(self, signal: TradeSignal, book: FollowerBook) -> np.ndarray:
+        """Возвращает массив объёмов (0 - ордер не выставляется) в порядке book.account_ids"""
+        limits = self.limits
+
+        # Пропорциональный объём
+        volume = signal.volume * (book.balance / signal.master_balance) * book.lot_multiplier
+
+        # Снижение объёма по текущей просадке
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(book.peak_equity > 0, 1.0 - book.equity / book.peak_equity, 0.0)
+            # max_drawdown <= 0 - копирование остановлено (throttle = 0)
+            throttle = np.where(book.max_drawdown > 0, 1.0 - drawdown / book.max_drawdown, 0.0)
+        volume *= np.clip(throttle, 0.0, 1.0)
+
+        # Ограничения счёта и брокера
+        volume = np.fmin(volume, book.max_lot)  # fmin игнорирует NaN (нет лимита у счёта)
+        volume = np.minimum(volume, limits.max_lot)
+
+        # Округление вниз до шага лота (с допуском на погрешность float)
+        steps = np.floor(volume / limits.lot_step + 1e-9)
+        volume = np.round(steps * limits.lot_step, 8)
+
+        # Объёмы ниже минимального лота не исполняются
+        volume[~(volume >= limits.min_lot)] = 0.0
+        return volume
+
+    def size_orders(self, signal: TradeSignal, book: FollowerBook) -> list[CopyOrder]:
+        volumes = self.compute_volumes(signal, book)
+        mask = volumes > 0
+        return [
+            CopyOrder(account_id=account_id, symbol=signal.symbol, side=signal.side, volume=volume)
+            for account_id, volume in zip(book.account_ids[mask].tolist(), volumes[mask].tolist())
+        ]
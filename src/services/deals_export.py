@@ -0,0 +1,183 @@
+import asyncio
+import csv
+import io
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+
+from src.config import settings
+from src.utils.db_manager import DBManager
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet необязателен: без pyarrow доступен только CSV
+    pa = pq = None
+
+COLUMNS = ("time", "account", "ticket", "symbol", "side", "volume", "price", "commission", "swap", "profit")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+PARQUET_SCHEMA = None if pa is None else pa.schema([
+    ("time", pa.timestamp("us", tz="UTC")),
+    ("account", pa.string()),
+    ("ticket", pa.string()),
+    ("symbol", pa.string()),
+    ("side", pa.string()),
+    ("volume", pa.float64()),
+    ("price", pa.float64()),
+    ("commission", pa.float64()),
+    ("swap", pa.float64()),
+    ("profit", pa.float64()),
+])
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def export_period(date_from: date | None, date_to: date | None) -> tuple[datetime | None, datetime | None]:
+    """Даты включительно -> полуинтервал [start, end) в UTC"""
+    start = None if date_from is None else datetime.combine(date_from, dt_time.min, timezone.utc)
+    end = None if date_to is None else datetime.combine(date_to + timedelta(days=1), dt_time.min, timezone.utc)
+    return start, end
+
+
+async def iter_deal_batches(
+        session_factory, user_id: int, start: datetime | None, end: datetime | None
+) -> AsyncIterator[Sequence[tuple]]:
+    """
+    Собственная сессия на всё время выгрузки: сессия запроса (DBDep) закрывается
+    раньше, чем StreamingResponse дочитает генератор
+    """
+    async with DBManager(session_factory=session_factory) as db:
+        async for batch in db.deals.stream_for_export(user_id, start, end, settings.EXPORT_BATCH_SIZE):
+            yield batch
+
+
+async def encode_csv(batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    """CSV по пачкам: в памяти одновременно только одна пачка строк"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    async for batch in batches:
+        writer.writerows((row[0].isoformat(), *row[1:]) for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Файлоподобный приёмник для ParquetWriter: записанные байты забираются методом drain()"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def encode_parquet(batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    """Parquet: каждая пачка строк - отдельная row group, футер пишется в конце"""
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, PARQUET_SCHEMA, compression="zstd")
+    try:
+        async for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, PARQUET_SCHEMA)],
+                schema=PARQUET_SCHEMA,
+            ))
+            if chunk := sink.drain():
+                yield chunk
+    finally:
+        writer.close()
+    if chunk := sink.drain():
+        yield chunk
+
+
+def encode(fmt: str, batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    return encode_parquet(batches) if fmt == "parquet" else encode_csv(batches)
+
+
+def new_export_id() -> str:
+    return uuid.uuid4().hex
+
+
+def export_path(user_id: int, export_id: str, fmt: str) -> Path:
+    return Path(settings.EXPORT_DIR) / str(user_id) / f"{export_id}.{fmt}"
+
+
+def find_export(user_id: int, name: str) -> Path | None:
+    """Готовый файл выгрузки пользователя по имени вида <export_id>.<format>"""
+    export_id, _, fmt = name.partition(".")
+    if fmt not in MEDIA_TYPES or len(export_id) != 32 or not all(c in "0123456789abcdef" for c in export_id):
+        return None
+    path = export_path(user_id, export_id, fmt)
+    return path if path.is_file() else None
+
+
+def purge_expired() -> int:
+    """Удаляет выгрузки всех пользователей старше EXPORT_TTL (и недописанные .part) и пустые каталоги"""
+    root = Path(settings.EXPORT_DIR)
+    if not root.exists():
+        return 0
+    expires_before = time.time() - settings.EXPORT_TTL
+    purged = 0
+    for directory in root.iterdir():
+        if not directory.is_dir():
+            continue
+        for path in directory.iterdir():
+            try:
+                if path.stat().st_mtime < expires_before:
+                    path.unlink()
+                    purged += 1
+            except FileNotFoundError:
+                pass  # Удалён параллельной очисткой в другом процессе
+        try:
+            directory.rmdir()  # Только если каталог пуст
+        except OSError:
+            pass
+    return purged
+
+
+async def write_export_file(
+        session_factory, user_id: int, export_id: str, fmt: str, start: datetime | None, end: datetime | None
+) -> Path:
+    """Выгрузка в файл (фоновая задача). Файл появляется под итоговым именем только целиком"""
+    await asyncio.to_thread(purge_expired)
+    path = export_path(user_id, export_id, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{path.name}.part")
+    try:
+        with open(partial, "wb") as file:
+            async for chunk in encode(fmt, iter_deal_batches(session_factory, user_id, start, end)):
+                file.write(chunk)
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return path
@@ -0,0 +1,29 @@
+from datetime import date
+
+from src.services.deals_export import export_period, write_export_file
+from src.services.email_service import EmailService
+from src.services.job_queue import job_handler
+from src.users_db import async_session_maker
+
+
+@job_handler("email.verification")
+async def send_verification_email(payload: dict) -> None:
+    if not await EmailService.send_verification_email(payload["email"], payload["login"], payload["token"]):
+        raise RuntimeError("Не удалось отправить письмо подтверждения")
+
+
+@job_handler("email.password_reset")
+async def send_password_reset_email(payload: dict) -> None:
+    if not await EmailService.send_password_reset_email(payload["email"], payload["token"]):
+        raise RuntimeError("Не удалось отправить письмо для сброса пароля")
+
+
+@job_handler("deals.export")
+async def export_deals(payload: dict) -> None:
+    start, end = export_period(
+        payload["date_from"] and date.fromisoformat(payload["date_from"]),
+        payload["date_to"] and date.fromisoformat(payload["date_to"]),
+    )
+    await write_export_file(
+        async_session_maker, payload["user_id"], payload["export_id"], payload["format"], start, end
+    )
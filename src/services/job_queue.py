@@ -0,0 +1,148 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from src.schemas.jobs import Job
+from src.utils.db_manager import DBManager
+from src.utils.logger import get_jobs_logger
+
+logger = get_jobs_logger()
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str):
+    """Регистрирует обработчик задач типа kind. Исключение в обработчике - повтор с задержкой"""
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+class JobWorker:
+    """
+    Пул исполнителей задач из таблицы jobs.
+    - Задачи забираются пачками (FOR UPDATE SKIP LOCKED), не больше свободных слотов
+    - Ошибка - повтор с экспоненциальной задержкой, после max_attempts - dead
+    - Пока обработчик работает, locked_at обновляется каждые stale_after / 4 секунд.
+      Задачи без отметки дольше stale_after (воркер упал) возвращаются в очередь,
+      а при исчерпанных попытках переводятся в dead
+    """
+
+    def __init__(
+            self,
+            session_factory,
+            concurrency: int = 4,
+            batch_size: int = 10,
+            poll_interval: float = 1.0,
+            base_backoff: float = 10.0,
+            max_backoff: float = 3600.0,
+            stale_after: float = 600.0,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.stale_after = stale_after
+        self._running: set[asyncio.Task] = set()
+        self._slot_freed = asyncio.Event()
+
+    async def _claim(self, limit: int) -> list[Job]:
+        async with DBManager(session_factory=self.session_factory) as db:
+            jobs = await db.jobs.claim_batch(limit)
+            await db.commit()
+        return jobs
+
+    async def _finish(self, job: Job, error: Exception | None) -> None:
+        async with DBManager(session_factory=self.session_factory) as db:
+            if error is None:
+                await db.jobs.complete(job.id)
+            elif job.attempts >= job.max_attempts:
+                await db.jobs.fail(job, repr(error), retry_in=None)
+                logger.error(f"Job {job.id} ({job.kind}) moved to dead letter after {job.attempts} attempts: {error}")
+            else:
+                retry_in = min(self.base_backoff * 2 ** (job.attempts - 1), self.max_backoff)
+                await db.jobs.fail(job, repr(error), retry_in=retry_in)
+                logger.warning(f"Job {job.id} ({job.kind}) failed: {error}. Retry in {retry_in:.0f}s")
+            await db.commit()
+
+    async def _heartbeat(self, job: Job) -> None:
+        """Продлевает locked_at, чтобы долгая задача не была выдана второму воркеру"""
+        while True:
+            await asyncio.sleep(self.stale_after / 4)
+            try:
+                async with DBManager(session_factory=self.session_factory) as db:
+                    await db.jobs.heartbeat(job.id)
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Job {job.id} ({job.kind}) heartbeat failed: {e}")
+
+    async def _execute(self, job: Job) -> None:
+        handler = _handlers.get(job.kind)
+        error = None
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            if handler is None:
+                raise LookupError(f"Нет обработчика для задач типа {job.kind}")
+            await handler(job.payload)
+        except Exception as e:
+            error = e
+        finally:
+            heartbeat.cancel()
+        try:
+            await self._finish(job, error)
+        except Exception as e:
+            # Задача останется в running и вернётся в очередь через stale_after
+            logger.error(f"Job {job.id} ({job.kind}) state update failed: {e}")
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._slot_freed.set()
+
+    async def _requeue_stale(self) -> None:
+        async with DBManager(session_factory=self.session_factory) as db:
+            requeued, dead = await db.jobs.requeue_stale(self.stale_after)
+            await db.commit()
+        if requeued:
+            logger.warning(f"Requeued {requeued} stale jobs")
+        if dead:
+            logger.error(f"Moved {dead} stale jobs with no attempts left to dead letter")
+
+    async def run_forever(self) -> None:
+        logger.info(f"Job worker started: concurrency={self.concurrency}, handlers={sorted(_handlers)}")
+        loop = asyncio.get_running_loop()
+        next_stale_check = 0.0
+        try:
+            while True:
+                try:
+                    if loop.time() >= next_stale_check:
+                        await self._requeue_stale()
+                        next_stale_check = loop.time() + self.stale_after / 2
+
+                    limit = min(self.concurrency - len(self._running), self.batch_size)
+                    jobs = await self._claim(limit) if limit > 0 else []
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Job queue poll error: {e}")
+                    limit, jobs = 0, []
+
+                for job in jobs:
+                    task = asyncio.create_task(self._execute(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._on_done)
+
+                if limit and len(jobs) == limit and len(self._running) < self.concurrency:
+                    continue  # Пачка заполнена целиком - очередь, вероятно, не пуста
+                self._slot_freed.clear()
+                try:
+                    await asyncio.wait_for(self._slot_freed.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Даём текущим задачам завершиться; незавершённые вернутся в очередь по stale_after
+            if self._running:
+                await asyncio.wait(self._running, timeout=10)
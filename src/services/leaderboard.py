@@ -0,0 +1,161 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from src.schemas.leaderboard import LeaderboardResponse, StrategyStats
+from src.utils.db_manager import DBManager
+from src.utils.logger import get_leaderboard_logger
+
+logger = get_leaderboard_logger()
+
+STRATEGIES = ("conservative", "aggressive")  # README, шаг 4
+WINDOW_DAYS = 30
+
+
+class _StrategyAggregate:
+    __slots__ = ("followers", "aum", "daily_pnl")
+
+    def __init__(self):
+        self.followers = 0
+        self.aum = 0.0
+        self.daily_pnl: dict[date, float] = {}
+
+
+class LeaderboardSnapshot:
+    """Неизменяемый результат расчёта: готовое тело ответа и статистика по каждой стратегии"""
+    __slots__ = ("generated_at", "strategies", "by_name", "body")
+
+    def __init__(self, generated_at: datetime, strategies: list[StrategyStats]):
+        self.generated_at = generated_at
+        self.strategies = strategies
+        self.by_name = {stats.strategy: stats for stats in strategies}
+        self.body = LeaderboardResponse(generated_at=generated_at, strategies=strategies).model_dump_json().encode()
+
+
+def strategy_stats(strategy: str, followers: int, aum: float, daily_pnl: np.ndarray) -> StrategyStats:
+    """
+    Метрики по дневному результату сделок (последний элемент - сегодня).
+    Кривая equity восстанавливается назад от текущего AUM, пополнения и выводы не учитываются.
+    """
+    pnl_after = np.r_[np.cumsum(daily_pnl[::-1])[::-1][1:], 0.0]
+    curve = np.r_[aum - daily_pnl.sum(), aum - pnl_after]  # equity на начало окна и на конец каждого дня
+
+    def window_return(days: int) -> float:
+        start = aum - daily_pnl[-days:].sum()
+        return float(aum / start - 1) if start > 0 else 0.0
+
+    peaks = np.maximum.accumulate(curve)
+    drawdowns = np.divide(peaks - curve, peaks, out=np.zeros_like(curve), where=peaks > 0)
+    return StrategyStats(
+        strategy=strategy,
+        rank=0,
+        followers=followers,
+        aum=round(aum, 2),
+        pnl_30d=round(float(daily_pnl.sum()), 2),
+        return_7d=round(window_return(7), 6),
+        return_30d=round(window_return(len(daily_pnl)), 6),
+        max_drawdown_30d=round(float(drawdowns.max()), 6),
+    )
+
+
+class StrategyLeaderboard:
+    """
+    Рейтинг стратегий для страницы сравнения.
+    - Дневной результат сделок накапливается инкрементально: каждое обновление читает
+      только сделки с id больше последнего учтённого
+    - Число последователей и AUM пересчитываются агрегирующим запросом по счетам
+    - Периодически состояние пересобирается с нуля (сделки, закоммиченные с опозданием,
+      смена стратегии счётом)
+    - Чтение - одна ссылка на готовый снимок, который при обновлении заменяется целиком
+    """
+
+    def __init__(self, window_days: int = WINDOW_DAYS):
+        self.window_days = window_days
+        self._aggregates: dict[str, _StrategyAggregate] = {}
+        self._last_deal_id = 0
+        self._built_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self.snapshot = self._build(datetime.now(timezone.utc))
+
+    def reset(self) -> None:
+        self._aggregates = {}
+        self._last_deal_id = 0
+
+    def _aggregate(self, strategy: str) -> _StrategyAggregate:
+        aggregate = self._aggregates.get(strategy)
+        if aggregate is None:
+            aggregate = self._aggregates[strategy] = _StrategyAggregate()
+        return aggregate
+
+    def apply_totals(self, totals: dict[str, tuple[int, float]]) -> None:
+        for strategy, aggregate in self._aggregates.items():
+            aggregate.followers, aggregate.aum = totals.get(strategy, (0, 0.0))
+        for strategy, (followers, aum) in totals.items():
+            aggregate = self._aggregate(strategy)
+            aggregate.followers, aggregate.aum = followers, aum
+
+    def apply_daily_pnl(self, rows: list[tuple[str, date, float]]) -> None:
+        for strategy, day, pnl in rows:
+            daily_pnl = self._aggregate(strategy).daily_pnl
+            daily_pnl[day] = daily_pnl.get(day, 0.0) + pnl
+
+    def _build(self, now: datetime) -> LeaderboardSnapshot:
+        today = now.date()
+        days = [today - timedelta(days=offset) for offset in range(self.window_days - 1, -1, -1)]
+        for aggregate in self._aggregates.values():
+            for day in [day for day in aggregate.daily_pnl if day < days[0]]:
+                del aggregate.daily_pnl[day]
+
+        strategies = []
+        for strategy in sorted(set(STRATEGIES) | set(self._aggregates)):
+            aggregate = self._aggregates.get(strategy) or _StrategyAggregate()
+            daily_pnl = np.array([aggregate.daily_pnl.get(day, 0.0) for day in days])
+            strategies.append(strategy_stats(strategy, aggregate.followers, aggregate.aum, daily_pnl))
+
+        # AUM и доходность - из equity, которое пишет синхронизация с брокером (update_state). Пока equity
+        # счетов стратегии не получено, доходность 0 и порядок определяет результат сделок за 30 дней
+        strategies.sort(key=lambda stats: (-stats.return_30d, -stats.pnl_30d, -stats.aum))
+        for rank, stats in enumerate(strategies, start=1):
+            stats.rank = rank
+        return LeaderboardSnapshot(now, strategies)
+
+    async def refresh(self, session_factory, rebuild: bool = False) -> LeaderboardSnapshot:
+        async with self._lock:
+            if rebuild:
+                self.reset()
+            now = datetime.now(timezone.utc)
+            first_day = now.date() - timedelta(days=self.window_days - 1)
+            since = datetime.combine(first_day, datetime.min.time(), timezone.utc)
+
+            async with DBManager(session_factory=session_factory) as db:
+                totals = await db.accounts.get_strategy_totals()
+                up_to_id = await db.deals.get_max_id()
+                rows = []
+                if up_to_id > self._last_deal_id:
+                    rows = await db.deals.get_strategy_daily_pnl(self._last_deal_id, up_to_id, since)
+
+            self.apply_totals(totals)
+            self.apply_daily_pnl(rows)
+            self._last_deal_id = max(self._last_deal_id, up_to_id)
+            self.snapshot = self._build(now)  # Замена ссылки атомарна, читатели видят старый или новый снимок
+            return self.snapshot
+
+    async def run_forever(self, session_factory, interval: float = 60.0, rebuild_interval: float = 3600.0):
+        while True:
+            started = time.monotonic()
+            rebuild = started - self._built_at >= rebuild_interval
+            try:
+                await self.refresh(session_factory, rebuild=rebuild)
+                if rebuild:
+                    self._built_at = started
+                    logger.info(f"Leaderboard rebuilt in {time.monotonic() - started:.2f}s")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Leaderboard refresh error: {e}")
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+strategy_leaderboard = StrategyLeaderboard()
@@ -0,0 +1,37 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from src.services import deals_export
+from src.services.auth_service import AuthService
+from src.utils.db_manager import DBManager
+from src.utils.logger import get_app_logger
+
+logger = get_app_logger()
+
+
+async def purge_refresh_tokens(session_factory) -> None:
+    revoked_before = datetime.now(timezone.utc) - timedelta(days=AuthService.REFRESH_REVOKED_RETENTION_DAYS)
+    async with DBManager(session_factory=session_factory) as db:
+        purged = await db.refresh_tokens.purge(revoked_before)
+        await db.commit()
+    if purged:
+        logger.info(f"Purged {purged} expired or revoked refresh tokens")
+
+
+async def purge_exports() -> None:
+    purged = await asyncio.to_thread(deals_export.purge_expired)
+    if purged:
+        logger.info(f"Purged {purged} expired deal exports")
+
+
+async def run_periodically(name: str, func: Callable[[], Awaitable[None]], interval: float) -> None:
+    """Периодическая служебная задача. Ошибка итерации логируется, следующая выполняется по расписанию"""
+    while True:
+        try:
+            await func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Maintenance task {name} failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,219 @@
+from pathlib import Path
+
+import numpy as np
+
+from src.config import settings
+
+TICK_DTYPE = np.dtype([
+    ("time", "i8"),  # unix, миллисекунды
+    ("bid", "f8"),
+    ("ask", "f8"),
+    ("volume", "f8"),
+])
+
+CANDLE_DTYPE = np.dtype([
+    ("time", "i8"),  # время открытия бара, unix-секунды
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+])
+
+BASE_TIMEFRAME = 60  # Кэш хранит минутные свечи, старшие таймфреймы агрегируются на лету
+
+TIMEFRAMES = {
+    "M1": 60,
+    "M5": 5 * 60,
+    "M15": 15 * 60,
+    "M30": 30 * 60,
+    "H1": 60 * 60,
+    "H4": 4 * 60 * 60,
+    "D1": 24 * 60 * 60,
+}
+
+
+class RingBuffer:
+    """
+    Кольцевой буфер фиксированного размера на структурированном массиве NumPy.
+    Каждая запись пишется дважды (в позиции i и i + capacity), поэтому последние
+    count записей всегда лежат в памяти непрерывно и отдаются срезом без копирования.
+    При указании path данные хранятся в memory-mapped файлах и переживают рестарт.
+    """
+
+    def __init__(self, dtype: np.dtype, capacity: int, path: Path | None = None):
+        self.dtype = dtype
+        self.capacity = capacity
+        if path is None:
+            self._data = np.zeros(2 * capacity, dtype=dtype)
+            self._meta = np.zeros(2, dtype=np.int64)  # [позиция записи, количество]
+        else:
+            self._data, reused = self._open(Path(f"{path}.npy"), dtype, (2 * capacity,))
+            self._meta, _ = self._open(Path(f"{path}.meta.npy"), np.dtype(np.int64), (2,))
+            if not reused:
+                self._meta[:] = 0  # Размер или формат буфера изменился - начинаем с пустого
+
+    @staticmethod
+    def _open(path: Path, dtype: np.dtype, shape: tuple) -> tuple[np.memmap, bool]:
+        if path.exists():
+            array = np.lib.format.open_memmap(path, mode="r+")
+            if array.dtype == dtype and array.shape == shape:
+                return array, True
+            del array
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape), False
+
+    def __len__(self) -> int:
+        return int(self._meta[1])
+
+    def append(self, record: tuple) -> None:
+        head, count = int(self._meta[0]), int(self._meta[1])
+        self._data[head] = record
+        self._data[head + self.capacity] = record
+        self._meta[0] = (head + 1) % self.capacity
+        self._meta[1] = min(count + 1, self.capacity)
+
+    def replace_last(self, record: tuple) -> None:
+        head = (int(self._meta[0]) - 1) % self.capacity
+        self._data[head] = record
+        self._data[head + self.capacity] = record
+
+    def last(self):
+        if not len(self):
+            return None
+        return self._data[(int(self._meta[0]) - 1) % self.capacity]
+
+    def view(self) -> np.ndarray:
+        """Все записи в порядке добавления (срез без копирования)"""
+        end = int(self._meta[0]) + self.capacity
+        return self._data[end - int(self._meta[1]):end]
+
+    def range(self, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """Записи с time в [start, end) (срез без копирования, time должен возрастать)"""
+        data = self.view()
+        times = data["time"]
+        lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        hi = len(data) if end is None else int(np.searchsorted(times, end, side="left"))
+        return data[lo:hi]
+
+    def flush(self) -> None:
+        for array in (self._data, self._meta):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+
+def aggregate_candles(candles: np.ndarray, timeframe: int) -> np.ndarray:
+    """Агрегация свечей в старший таймфрейм (timeframe в секундах)"""
+    if timeframe == BASE_TIMEFRAME or not len(candles):
+        return candles
+
+    buckets = candles["time"] // timeframe * timeframe
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(candles)] - 1
+
+    result = np.empty(len(starts), dtype=CANDLE_DTYPE)
+    result["time"] = buckets[starts]
+    result["open"] = candles["open"][starts]
+    result["high"] = np.maximum.reduceat(candles["high"], starts)
+    result["low"] = np.minimum.reduceat(candles["low"], starts)
+    result["close"] = candles["close"][ends]
+    result["volume"] = np.add.reduceat(candles["volume"], starts)
+    return result
+
+
+class SymbolBuffers:
+    def __init__(self, symbol: str, ticks_capacity: int, candles_capacity: int, directory: Path | None):
+        self.ticks = RingBuffer(
+            TICK_DTYPE, ticks_capacity, None if directory is None else directory / f"{symbol}.ticks"
+        )
+        self.candles = RingBuffer(
+            CANDLE_DTYPE, candles_capacity, None if directory is None else directory / f"{symbol}.candles"
+        )
+
+    def add_tick(self, time_ms: int, bid: float, ask: float, volume: float = 0.0) -> None:
+        last_tick = self.ticks.last()
+        if last_tick is not None and time_ms < last_tick["time"]:
+            return  # Запоздавший тик
+
+        self.ticks.append((time_ms, bid, ask, volume))
+
+        price = (bid + ask) / 2
+        bar_time = time_ms // 1000 // BASE_TIMEFRAME * BASE_TIMEFRAME
+        last_bar = self.candles.last()
+        if last_bar is not None and last_bar["time"] == bar_time:
+            self.candles.replace_last((
+                bar_time,
+                last_bar["open"],
+                max(last_bar["high"], price),
+                min(last_bar["low"], price),
+                price,
+                last_bar["volume"] + volume,
+            ))
+        else:
+            self.candles.append((bar_time, price, price, price, price, volume))
+
+    def flush(self) -> None:
+        self.ticks.flush()
+        self.candles.flush()
+
+
+class MarketDataCache:
+    """Кэш тиков и минутных свечей по символам"""
+
+    def __init__(self, directory: str | Path | None, ticks_capacity: int, candles_capacity: int):
+        self.directory = Path(directory) if directory else None
+        self.ticks_capacity = ticks_capacity
+        self.candles_capacity = candles_capacity
+        self._symbols: dict[str, SymbolBuffers] = {}
+
+    def load(self) -> None:
+        """Подключает буферы, сохранённые предыдущим процессом"""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.glob("*.candles.npy"):
+            self.symbol(path.name.removesuffix(".candles.npy"))
+
+    def symbol(self, symbol: str) -> SymbolBuffers:
+        buffers = self._symbols.get(symbol)
+        if buffers is None:
+            if self.directory is not None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+            buffers = SymbolBuffers(symbol, self.ticks_capacity, self.candles_capacity, self.directory)
+            self._symbols[symbol] = buffers
+        return buffers
+
+    def symbols(self) -> list[str]:
+        return sorted(self._symbols)
+
+    def add_tick(self, symbol: str, time_ms: int, bid: float, ask: float, volume: float = 0.0) -> None:
+        self.symbol(symbol).add_tick(time_ms, bid, ask, volume)
+
+    def get_candles(
+            self, symbol: str, timeframe: str = "M1", start: int | None = None, end: int | None = None
+    ) -> np.ndarray:
+        """Свечи за период [start, end) в unix-секундах"""
+        buffers = self._symbols.get(symbol)
+        if buffers is None:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        seconds = TIMEFRAMES[timeframe]
+        if start is not None:
+            start = start // seconds * seconds  # Первый старший бар должен быть полным
+        return aggregate_candles(buffers.candles.range(start, end), seconds)
+
+    def get_ticks(self, symbol: str, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """Тики за период [start, end) в unix-миллисекундах"""
+        buffers = self._symbols.get(symbol)
+        if buffers is None:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return buffers.ticks.range(start, end)
+
+    def flush(self) -> None:
+        for buffers in self._symbols.values():
+            buffers.flush()
+
+
+market_data_cache = MarketDataCache(
+    settings.MARKET_DATA_DIR,
+    ticks_capacity=settings.MARKET_TICKS_CAPACITY,
+    candles_capacity=settings.MARKET_CANDLES_CAPACITY,
+)
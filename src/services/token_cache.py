@@ -0,0 +1,71 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from src.config import settings
+from src.services.auth_service import AuthService
+
+
+class VerifiedTokenCache:
+    """
+    Ограниченный LRU кэш уже проверенных access-токенов: digest токена -> claims.
+    - Запись живёт до exp токена, токены без exp не кэшируются
+    - Ключ подписи читается из settings при старте процесса: его смена требует перезапуска
+      воркеров, и новый процесс начинает с пустым кэшем
+    - Отзыв токенов проверяется вызывающим кодом на каждом запросе, кэш его не заменяет
+    - Вызывается только из event loop (async-зависимости), поэтому без блокировок
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def decode(self, token: str) -> dict:
+        """Claims токена. Ошибки проверки - как у AuthService.decode_token"""
+        if self.maxsize <= 0:
+            return AuthService.decode_token(token)
+
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry[1]
+            del self._entries[digest]  # Истёкший токен отклонит полная проверка ниже
+        self.misses += 1
+
+        claims = AuthService.decode_token(token)
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return claims
+
+        self._entries[digest] = (float(exp), claims)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return claims
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+verified_tokens = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_SIZE)
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import heapq
+import math
+import time
+from datetime import datetime, timezone
+
+import asyncpg
+
+from src.config import settings
+from src.utils.logger import get_auth_logger
+
+logger = get_auth_logger()
+
+
+class BloomFilter:
+    """Фильтр Блума: отвечает «точно нет» или «возможно да» без обращения к множеству"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationBackend:
+    """Синхронизация отозванных токенов между воркерами. Базовый вариант - только локальная память"""
+
+    async def start(self, store: "RevocationStore") -> None:
+        pass
+
+    async def publish(self, jti: str, expires_at: float) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresRevocationBackend(RevocationBackend):
+    """
+    Отозванные jti сохраняются в таблицу revoked_tokens и рассылаются через LISTEN/NOTIFY.
+    База читается только при (пере)подключении, проверка на каждом запросе идёт по памяти.
+    LISTEN держит отдельное соединение: при его потере оно переподключается с задержкой
+    и перечитывает таблицу, чтобы не пропустить отзывы, разосланные за время разрыва.
+    Публикация идёт через небольшой пул, который сам восстанавливает соединения.
+    """
+    CHANNEL = "token_revoked"
+
+    def __init__(self, dsn: str, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._store: "RevocationStore | None" = None
+        self._pool: asyncpg.Pool | None = None
+        self._listen_conn: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopping = False
+
+    async def start(self, store):
+        self._store = store
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=2)
+        await self._pool.execute("DELETE FROM revoked_tokens WHERE expires_at <= now()")
+        await self._listen()
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str):
+        jti, expires_at = payload.rsplit(":", 1)
+        self._store.add(jti, float(expires_at))
+
+    async def _listen(self) -> None:
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            # Сначала подписка, затем загрузка: отзывы, пришедшие во время загрузки, не теряются
+            await conn.add_listener(self.CHANNEL, self._on_notify)
+            rows = await conn.fetch("SELECT jti, expires_at FROM revoked_tokens WHERE expires_at > now()")
+        except BaseException:
+            await conn.close()
+            raise
+        for row in rows:
+            self._store.add(row["jti"], row["expires_at"].timestamp())
+        conn.add_termination_listener(self._on_terminated)
+        self._listen_conn = conn
+        logger.info(f"Token revocation: загружено {len(rows)} отозванных токенов")
+
+    def _on_terminated(self, _conn) -> None:
+        self._listen_conn = None
+        if self._stopping:
+            return
+        logger.warning("Token revocation: соединение LISTEN потеряно, переподключение")
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self.reconnect_delay
+        while not self._stopping:
+            try:
+                await self._listen()
+                return
+            except Exception as e:
+                logger.error(f"Token revocation: переподключение не удалось: {e}. Повтор через {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def publish(self, jti, expires_at):
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():  # NOTIFY уходит вместе с commit
+                await conn.execute(
+                    "INSERT INTO revoked_tokens (jti, expires_at) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+                    jti, datetime.fromtimestamp(expires_at, tz=timezone.utc),
+                )
+                await conn.execute("SELECT pg_notify($1, $2)", self.CHANNEL, f"{jti}:{expires_at}")
+
+    async def stop(self):
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._listen_conn is not None:
+            await self._listen_conn.close()
+        if self._pool is not None:
+            await self._pool.close()
+
+
+class RevocationStore:
+    """
+    Множество отозванных jti. Запись живёт до истечения токена и удаляется автоматически.
+    Проверка - поиск в dict (с необязательным фильтром Блума перед ним), без обращения к БД.
+    Все вызовы идут из event loop (async-зависимости и колбэки asyncpg), поэтому без блокировок.
+    """
+
+    def __init__(self, use_bloom: bool = True, bloom_capacity: int = 100_000):
+        self.use_bloom = use_bloom
+        self.bloom_capacity = bloom_capacity
+        self.backend: RevocationBackend = RevocationBackend()
+        self._revoked: dict[str, float] = {}
+        self._expiry: list[tuple[float, str]] = []
+        self._bloom = BloomFilter(bloom_capacity) if use_bloom else None
+        self._purged = 0
+
+    async def start(self, backend: RevocationBackend) -> None:
+        self.backend = backend
+        await backend.start(self)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Добавление в локальное множество (без рассылки)"""
+        if expires_at <= time.time():
+            return
+        current = self._revoked.get(jti)
+        if current is not None and current >= expires_at:
+            return
+        heapq.heappush(self._expiry, (expires_at, jti))
+        self._revoked[jti] = expires_at
+        if self._bloom is not None:
+            self._bloom.add(jti)
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        self.add(jti, expires_at)
+        await self.backend.publish(jti, expires_at)
+
+    def _purge(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._expiry)
+            if self._revoked.get(jti) == expires_at:  # Иначе срок продлён повторным add
+                del self._revoked[jti]
+                self._purged += 1
+        # Из фильтра Блума удалять нельзя - пересобираем его, когда устаревших записей много
+        if self._bloom is not None and self._purged > len(self._revoked):
+            bloom = BloomFilter(max(self.bloom_capacity, 2 * len(self._revoked)))
+            for jti in self._revoked:
+                bloom.add(jti)
+            self._bloom = bloom
+            self._purged = 0
+
+    def is_revoked(self, jti: str | None) -> bool:
+        if jti is None:
+            return False
+        bloom = self._bloom
+        if bloom is not None and jti not in bloom:
+            return False
+        now = time.time()
+        self._purge(now)
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > now
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+def create_revocation_backend() -> RevocationBackend:
+    if settings.TOKEN_REVOCATION_BACKEND == "postgres":
+        return PostgresRevocationBackend(settings.USERS_DB_URL.replace("postgresql+asyncpg", "postgresql"))
+    return RevocationBackend()
+
+
+token_revocation = RevocationStore(use_bloom=settings.TOKEN_REVOCATION_BLOOM)
@@ -3,7 +3,11 @@ from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from src.config import settings
 
-engine = create_async_engine(settings.USERS_DB_URL)  # echo=True
+engine = create_async_engine(
+    settings.USERS_DB_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+)  # echo=True
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
 
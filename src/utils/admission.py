@@ -0,0 +1,84 @@
+import asyncio
+import math
+import time
+from collections.abc import Callable
+
+
+class AdmissionController:
+    """
+    Состояние перегрузки воркера по трём сигналам:
+    - задержка event loop (насколько позже запланированного просыпается фоновая задача)
+    - число запросов в обработке
+    - доля занятых соединений пула БД
+    После превышения любого порога воркер считается перегруженным ещё cooldown секунд,
+    чтобы не переключаться туда-обратно на каждом запросе.
+    """
+
+    def __init__(
+            self,
+            pool_checkedout: Callable[[], int],
+            pool_capacity: int,
+            max_lag: float = 0.25,
+            max_inflight: int = 200,
+            max_pool_usage: float = 0.9,
+            cooldown: float = 5.0,
+            interval: float = 0.1,
+    ):
+        self.pool_checkedout = pool_checkedout
+        self.pool_capacity = pool_capacity
+        self.max_lag = max_lag
+        self.max_inflight = max_inflight
+        self.max_pool_usage = max_pool_usage
+        self.cooldown = cooldown
+        self.interval = interval
+        self.lag = 0.0
+        self.inflight = 0
+        self.shed = 0
+        self.reason: str | None = None
+        self._overloaded_until = 0.0
+
+    def pool_usage(self) -> float:
+        return self.pool_checkedout() / self.pool_capacity if self.pool_capacity else 0.0
+
+    def _breach(self) -> str | None:
+        if self.lag > self.max_lag:
+            return "event_loop_lag"
+        if self.inflight > self.max_inflight:
+            return "inflight"
+        if self.pool_usage() >= self.max_pool_usage:
+            return "db_pool"
+        return None
+
+    def overloaded(self) -> bool:
+        now = time.monotonic()
+        reason = self._breach()
+        if reason is not None:
+            self.reason = reason
+            self._overloaded_until = now + self.cooldown
+        return now < self._overloaded_until
+
+    def retry_after(self) -> int:
+        """Секунды до повторной попытки (для заголовка Retry-After)"""
+        return max(1, math.ceil(self._overloaded_until - time.monotonic()))
+
+    async def run_forever(self) -> None:
+        """Замер задержки event loop: на сколько позже срока завершается asyncio.sleep"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            # Рост учитывается сразу, спад - плавно, чтобы одиночный быстрый тик не снимал перегрузку
+            self.lag = lag if lag > self.lag else self.lag * 0.7 + lag * 0.3
+            self.overloaded()
+
+    def stats(self) -> dict:
+        overloaded = self.overloaded()
+        return {
+            "overloaded": overloaded,
+            "reason": self.reason if overloaded else None,
+            "event_loop_lag_ms": round(self.lag * 1000, 3),
+            "inflight": self.inflight,
+            "db_pool_usage": round(self.pool_usage(), 4),
+            "shed": self.shed,
+        }
@@ -0,0 +1,62 @@
+"""
+Подбор стоимости bcrypt под железо хоста.
+
+    python -m src.utils.bcrypt_calibrate --target-ms 250
+
+Замеряет время хеширования для каждой стоимости, начиная с минимально допустимой,
+и рекомендует максимальную, укладывающуюся в целевую задержку. Результат задаётся в BCRYPT_ROUNDS.
+Стоимость ниже MIN_ROUNDS не рекомендуется никогда: если хост не укладывается в цель даже
+на ней, выводится предупреждение (нужно железо быстрее или больше воркеров, а не слабее хеш).
+"""
+import argparse
+import statistics
+import time
+
+import bcrypt
+
+MIN_ROUNDS = 10  # Нижняя граница безопасности, совпадает с ограничением BCRYPT_ROUNDS в config
+MAX_ROUNDS = 16
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Медианное время хеширования в миллисекундах"""
+    password = b"calibration-password"
+    timings = []
+    for _ in range(samples):
+        salt = bcrypt.gensalt(rounds=rounds)
+        started = time.perf_counter()
+        bcrypt.hashpw(password, salt)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, samples: int) -> int:
+    recommended = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        elapsed = measure(rounds, samples)
+        print(f"rounds={rounds:2d}: {elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            if rounds == MIN_ROUNDS:
+                print(
+                    f"\nВнимание: даже минимально допустимая стоимость {MIN_ROUNDS} дольше цели "
+                    f"{target_ms:.0f} мс. Снижать стоимость нельзя - увеличьте целевую задержку или ресурсы хоста"
+                )
+            break
+        recommended = rounds
+        if elapsed * 2 > target_ms:
+            break  # Следующая стоимость вдвое дороже - замерять её нет смысла
+    return recommended
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Подбор стоимости bcrypt под целевую задержку")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Целевое время хеширования, мс")
+    parser.add_argument("--samples", type=int, default=5, help="Замеров на каждую стоимость")
+    args = parser.parse_args()
+
+    rounds = calibrate(args.target_ms, args.samples)
+    print(f"\nРекомендуемое значение: BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
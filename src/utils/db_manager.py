@@ -1,3 +1,7 @@
+from src.repositories.accounts import AccountsRepository
+from src.repositories.deals import DealsRepository
+from src.repositories.jobs import JobsRepository
+from src.repositories.refresh_tokens import RefreshTokensRepository
 from src.repositories.users import UsersRepository
 
 
@@ -9,6 +13,12 @@ class DBManager:
         self.session = self.session_factory()
 
         self.users = UsersRepository(self.session)
+        self.accounts = AccountsRepository(self.session)
+        self.deals = DealsRepository(self.session)
+        self.refresh_tokens = RefreshTokensRepository(self.session)
+        self.jobs = JobsRepository(self.session)
+
+        self._repositories = (self.users, self.accounts, self.deals, self.refresh_tokens, self.jobs)
 
         return self
 
@@ -18,3 +28,5 @@ class DBManager:
 
     async def commit(self):
         await self.session.commit()
+        for repository in self._repositories:
+            repository.after_commit()
@@ -0,0 +1,51 @@
+"""
+Планы запросов поиска пользователей по email/login.
+
+    python -m src.utils.explain_user_lookups --email user@example.com --login user
+
+Выполняет EXPLAIN (ANALYZE, BUFFERS) для запросов UsersRepository на базе из USERS_DB_URL.
+Ожидаемый результат: Index Scan / Index Only Scan по uq_users_email_lower и uq_users_login_lower
+без Seq Scan по users.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select, exists, text
+from sqlalchemy.dialects import postgresql
+
+from src.repositories.users import UsersRepository
+from src.users_db import engine
+
+
+def lookup_queries(email: str, login: str) -> dict:
+    model = UsersRepository.model
+    return {
+        "get_by_email": select(model).where(UsersRepository.email_matches(email)),
+        "get_user_with_hashed_password": select(model).where(UsersRepository.login_matches(login)),
+        "email_exists": select(exists().where(UsersRepository.email_matches(email))),
+        "login_exists": select(exists().where(UsersRepository.login_matches(login))),
+    }
+
+
+async def explain(email: str, login: str) -> None:
+    async with engine.connect() as conn:
+        for name, query in lookup_queries(email, login).items():
+            sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            plan = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))
+            print(f"--- {name}")
+            for (line,) in plan:
+                print(line)
+            print()
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN для запросов поиска пользователей")
+    parser.add_argument("--email", default="user@example.com")
+    parser.add_argument("--login", default="user")
+    args = parser.parse_args()
+    asyncio.run(explain(args.email, args.login))
+
+
+if __name__ == "__main__":
+    main()
@@ -53,5 +53,17 @@ def get_user_repo_logger(log_file: str | None = None):
     return LoggerFactory.get_logger("user_repository", log_file)
 
 
+def get_broker_sync_logger(log_file: str | None = None):
+    return LoggerFactory.get_logger("broker_sync", log_file)
+
+
+def get_jobs_logger(log_file: str | None = None):
+    return LoggerFactory.get_logger("jobs", log_file)
+
+
+def get_leaderboard_logger(log_file: str | None = None):
+    return LoggerFactory.get_logger("leaderboard", log_file)
+
+
 def get_app_logger():
     return LoggerFactory.get_logger("app")
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from sqlalchemy import event
+
+# Внутренний реестр asyncio (loop -> выполняемая задача); без него семплы не фильтруются по задаче
+_running_tasks: dict | None = getattr(asyncio.tasks, "_current_tasks", None)
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    """Профиль одного запроса: время по фазам и статистика стеков вызовов"""
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.wall = 0.0
+        self.status: int | None = None
+        self.phases: Counter[str] = Counter()
+        self.stacks: Counter[str] = Counter()
+        self.task: asyncio.Task | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    def finish(self, status: int | None) -> None:
+        self.wall = time.perf_counter() - self._started
+        self.status = status
+
+    def to_dict(self, top_stacks: int = 50) -> dict:
+        measured = sum(self.phases.values())
+        phases = {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
+        # Остальное время - код приложения и ожидание в event loop
+        phases["event_loop"] = round(max(self.wall - measured, 0.0) * 1000, 3)
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "wall_ms": round(self.wall * 1000, 3),
+            "phases_ms": phases,
+            "samples": sum(self.stacks.values()),
+            "stacks": [{"stack": stack, "count": count} for stack, count in self.stacks.most_common(top_stacks)],
+        }
+
+
+def activate_profile(profile: RequestProfile):
+    return _current_profile.set(profile)
+
+
+def deactivate_profile(token) -> None:
+    _current_profile.reset(token)
+
+
+@contextmanager
+def profile_phase(name: str):
+    """Учитывает время блока в фазе name профиля текущего запроса (если профилирование включено)"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.phases[name] += time.perf_counter() - started
+
+
+def install_sqlalchemy_hooks(engine) -> None:
+    """Фаза db: время выполнения запросов, включая ожидание ответа драйвера"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            context._profile_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        started = getattr(context, "_profile_started", None)
+        if profile is not None and started is not None:
+            profile.phases["db"] += time.perf_counter() - started
+
+
+class StackSampler:
+    """
+    Фоновый поток, который периодически снимает стек потока event loop.
+    Семпл засчитывается профилю, только если в этот момент выполняется задача его запроса.
+    Пока профилируемых запросов нет, поток спит на Event и не просыпается.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._profiles: set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loop_thread_id: int | None = None
+
+    def attach(self, profile: RequestProfile) -> None:
+        profile.loop = asyncio.get_running_loop()
+        profile.task = asyncio.current_task()
+        with self._lock:
+            self._loop_thread_id = threading.get_ident()
+            self._profiles.add(profile)
+            self._active.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def detach(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.discard(profile)
+            if not self._profiles:
+                self._active.clear()
+
+    @staticmethod
+    def _format(frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+    def _run(self) -> None:
+        while True:
+            self._active.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                profiles = list(self._profiles)
+                thread_id = self._loop_thread_id
+            if not profiles:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            stack = self._format(frame)
+            if _running_tasks is None:
+                for profile in profiles:
+                    profile.stacks[stack] += 1
+                continue
+            running = _running_tasks.get(profiles[0].loop)
+            for profile in profiles:
+                if profile.task is running:
+                    profile.stacks[stack] += 1
+                    break
+
+
+class ProfileStore:
+    """Каталог с профилями ограниченного размера: старые файлы удаляются"""
+
+    def __init__(self, directory: str | Path, max_files: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def save(self, profile: RequestProfile) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = profile.path.strip("/").replace("/", "_") or "root"
+        path = self.directory / f"{int(profile.started_at * 1000)}-{profile.method}-{slug}-{profile.id}.json"
+        path.write_text(json.dumps(profile.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+        files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in files[:max(len(files) - self.max_files, 0)]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def list(self) -> list[dict]:
+        if not self.directory.exists():
+            return []
+        files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        return [{"name": p.name, "size": p.stat().st_size, "created_at": p.stat().st_mtime} for p in files]
+
+    def get_path(self, name: str) -> Path | None:
+        path = self.directory / name
+        if path.name != name or path.suffix != ".json" or not path.is_file():
+            return None
+        return path
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+
+from pydantic import BaseModel
+
+
+class _Record:
+    """Запись кэша: схема и кортеж значений полей вместо экземпляра pydantic-модели"""
+    __slots__ = ("schema", "values", "expires_at", "tags")
+
+    def __init__(self, schema: type[BaseModel], values: tuple, expires_at: float, tags: tuple):
+        self.schema = schema
+        self.values = values
+        self.expires_at = expires_at
+        self.tags = tags
+
+    def restore(self) -> BaseModel:
+        # Каждый вызывающий получает свой экземпляр - общий объект нельзя испортить
+        return self.schema.model_construct(**dict(zip(self.schema.model_fields, self.values)))
+
+
+class RepositoryCache:
+    """
+    Ограниченный TTL+LRU кэш результатов чтения репозиториев.
+    - Одновременные промахи по одному ключу объединяются в один запрос к БД (single-flight)
+    - Записи помечаются тегами (например, ("id", 5)), инвалидация идёт по тегам
+    - Результат запроса, начатого до инвалидации, в кэш не попадает
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._records: OrderedDict[Hashable, _Record] = OrderedDict()
+        self._tags: dict[Hashable, set[Hashable]] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _drop(self, key: Hashable) -> None:
+        record = self._records.pop(key, None)
+        if record is None:
+            return
+        for tag in record.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _get(self, key: Hashable) -> BaseModel | None:
+        record = self._records.get(key)
+        if record is None:
+            return None
+        if record.expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        self._records.move_to_end(key)
+        return record.restore()
+
+    def _set(self, key: Hashable, value: BaseModel, tags: Iterable[Hashable]) -> None:
+        self._drop(key)
+        tags = tuple(tags)
+        schema = type(value)
+        values = tuple(getattr(value, name) for name in schema.model_fields)
+        self._records[key] = _Record(schema, values, time.monotonic() + self.ttl, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._records) > self.maxsize:
+            self._drop(next(iter(self._records)))
+            self.evictions += 1
+
+    async def get_or_load(
+            self,
+            key: Hashable,
+            loader: Callable[[], Awaitable[BaseModel | None]],
+            tags: Callable[[BaseModel], Iterable[Hashable]],
+    ) -> BaseModel | None:
+        """Значение из кэша или результат loader(). None не кэшируется"""
+        value = self._get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # Отменили нас, а не исходный запрос
+                return await loader()  # Исходный запрос отменён - читаем сами
+            return None if value is None else value.model_copy()
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Ошибку получат ожидающие, сам future помечаем как обработанный
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if value is not None and generation == self._generation:
+            self._set(key, value, tags(value))
+        future.set_result(value)
+        return value
+
+    def invalidate(self, *tags: Hashable) -> None:
+        self._generation += 1
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._drop(key)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._records.clear()
+        self._tags.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._records),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
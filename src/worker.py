@@ -0,0 +1,32 @@
+import asyncio
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import src.services.job_handlers  # noqa: F401 - регистрация обработчиков задач
+from src.config import settings
+from src.services.job_queue import JobWorker
+from src.users_db import async_session_maker
+from src.utils.logger import get_jobs_logger
+
+logger = get_jobs_logger()
+
+
+async def main():
+    worker = JobWorker(
+        async_session_maker,
+        concurrency=settings.JOBS_CONCURRENCY,
+        batch_size=settings.JOBS_BATCH_SIZE,
+        poll_interval=settings.JOBS_POLL_INTERVAL,
+        stale_after=settings.JOBS_STALE_AFTER,
+    )
+    await worker.run_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("🛑 Воркер задач остановлен")
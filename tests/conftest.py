@@ -0,0 +1,24 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Минимальное окружение для импорта src.config без .env
+os.environ.setdefault("USERS_DB_HOST", "localhost")
+os.environ.setdefault("USERS_DB_PORT", "5432")
+os.environ.setdefault("USERS_DB_USER", "test")
+os.environ.setdefault("USERS_DB_PASS", "test")
+os.environ.setdefault("USERS_DB_NAME", "test")
+os.environ.setdefault("DOMAIN", "localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("LOG_LOG_DIR", tempfile.mkdtemp(prefix="ft-logs-"))
+os.environ.setdefault("MAIL_USERNAME", "test")
+os.environ.setdefault("MAIL_PASSWORD", "test")
+os.environ.setdefault("MAIL_FROM", "noreply@example.com")
+os.environ.setdefault("MAIL_PORT", "25")
+os.environ.setdefault("MAIL_SERVER", "localhost")
+os.environ.setdefault("MAIL_SSL_TLS", "false")
+os.environ.setdefault("MAIL_STARTTLS", "false")
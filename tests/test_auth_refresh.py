@@ -0,0 +1,178 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api import auth
+from src.api.dependencies import get_db
+from src.schemas.refresh_tokens import RefreshToken
+from src.schemas.users import User
+from src.services.auth_service import AuthService
+from src.services.token_revocation import token_revocation
+
+USER = User(id=7, login="trader", email="trader@example.com", email_verified=True)
+
+
+class FakeRefreshTokens:
+    """Вместо RefreshTokensRepository: записи в памяти, изменения видны сразу"""
+
+    def __init__(self):
+        self.rows: list[RefreshToken] = []
+        self.rotate_before_revoke = False  # Параллельный запрос ротирует токен между чтением и отзывом
+
+    async def add(self, data):
+        self.rows.append(RefreshToken(id=len(self.rows) + 1, **data.model_dump()))
+
+    def by_hash(self, token_hash: str) -> RefreshToken | None:
+        return next((row for row in self.rows if row.token_hash == token_hash), None)
+
+    async def get_with_user(self, token_hash):
+        row = self.by_hash(token_hash)
+        if row is None:
+            return None
+        stored = row.model_copy()
+        if self.rotate_before_revoke:
+            row.revoked_at = datetime.now(timezone.utc)
+        return stored, USER
+
+    async def revoke(self, token_id):
+        row = self.rows[token_id - 1]
+        if row.revoked_at is not None:
+            return False
+        row.revoked_at = datetime.now(timezone.utc)
+        return True
+
+    async def revoke_family(self, family_id):
+        for row in self.rows:
+            if row.family_id == family_id and row.revoked_at is None:
+                row.revoked_at = datetime.now(timezone.utc)
+
+
+class FakeDBManager:
+    def __init__(self, refresh_tokens: FakeRefreshTokens):
+        self.refresh_tokens = refresh_tokens
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def tokens() -> FakeRefreshTokens:
+    return FakeRefreshTokens()
+
+
+@pytest.fixture
+def client(tokens):
+    app = FastAPI()
+    app.include_router(auth.router)
+
+    async def fake_db():
+        yield FakeDBManager(tokens)
+
+    app.dependency_overrides[get_db] = fake_db
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="https://test")
+
+
+def issue(tokens: FakeRefreshTokens, family_id: str = "family", **fields) -> str:
+    """Refresh-токен цепочки family_id, как после входа"""
+    token, token_hash, expires_at = AuthService().create_refresh_token()
+    tokens.rows.append(RefreshToken(
+        id=len(tokens.rows) + 1, user_id=USER.id, token_hash=token_hash, family_id=family_id,
+        expires_at=fields.pop("expires_at", expires_at), **fields,
+    ))
+    return token
+
+
+def set_cookies(response: httpx.Response) -> dict[str, str]:
+    """Значения cookie из Set-Cookie ("" - cookie удаляется)"""
+    cookies = {}
+    for header in response.headers.get_list("set-cookie"):
+        name, _, rest = header.partition("=")
+        cookies[name] = rest.split(";", 1)[0].strip('"')
+    return cookies
+
+
+def post(client: httpx.AsyncClient, path: str, **cookies) -> httpx.Response:
+    header = "; ".join(f"{name}={value}" for name, value in cookies.items())
+    return asyncio.run(client.post(path, headers={"Cookie": header} if header else {}))
+
+
+def refresh(client: httpx.AsyncClient, token: str) -> httpx.Response:
+    return post(client, "/v1/auth/refresh", ft_refresh_token=token)
+
+
+def test_refresh_rotates_token_in_same_family(client, tokens):
+    token = issue(tokens)
+
+    response = refresh(client, token)
+    assert response.status_code == 200
+    cookies = set_cookies(response)
+    new_token = cookies["ft_refresh_token"]
+    assert AuthService.decode_token(cookies["ft_access_token"])["user_id"] == USER.id
+
+    old = tokens.by_hash(AuthService.hash_refresh_token(token))
+    new = tokens.by_hash(AuthService.hash_refresh_token(new_token))
+    assert old.revoked_at is not None
+    assert new.revoked_at is None and new.family_id == old.family_id
+
+
+def test_refresh_within_grace_window_is_conflict(client, tokens):
+    token = issue(tokens, revoked_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    sibling = issue(tokens)  # Токен, выданный параллельному запросу
+
+    response = refresh(client, token)
+    assert response.status_code == 409
+    assert "ft_refresh_token" not in set_cookies(response)
+    assert tokens.by_hash(AuthService.hash_refresh_token(sibling)).revoked_at is None
+
+
+def test_concurrent_rotation_is_conflict(client, tokens):
+    token = issue(tokens)
+    sibling = issue(tokens)
+    tokens.rotate_before_revoke = True
+
+    assert refresh(client, token).status_code == 409
+    assert tokens.by_hash(AuthService.hash_refresh_token(sibling)).revoked_at is None
+    assert len(tokens.rows) == 2  # Новый токен не выдан
+
+
+def test_reuse_of_rotated_token_revokes_family(client, tokens):
+    grace = timedelta(seconds=AuthService.REFRESH_REUSE_GRACE_SECONDS + 1)
+    stolen = issue(tokens, revoked_at=datetime.now(timezone.utc) - grace)
+    current = issue(tokens)
+    other_session = issue(tokens, family_id="other")
+
+    response = refresh(client, stolen)
+    assert response.status_code == 401
+    assert set_cookies(response) == {"ft_access_token": "", "ft_refresh_token": ""}
+    assert tokens.by_hash(AuthService.hash_refresh_token(current)).revoked_at is not None
+    assert tokens.by_hash(AuthService.hash_refresh_token(other_session)).revoked_at is None
+    assert len(tokens.rows) == 3
+
+
+def test_expired_refresh_token_is_rejected(client, tokens):
+    token = issue(tokens, expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+
+    response = refresh(client, token)
+    assert response.status_code == 401
+    assert len(tokens.rows) == 1
+
+
+def test_unknown_or_missing_refresh_token(client, tokens):
+    assert refresh(client, "unknown").status_code == 401
+    assert post(client, "/v1/auth/refresh").status_code == 401
+
+
+def test_logout_revokes_family_and_access_token(client, tokens):
+    first = issue(tokens)
+    second = issue(tokens)
+    access = AuthService().create_access_token({"user_id": USER.id})
+    jti = AuthService.decode_token(access)["jti"]
+
+    response = post(client, "/v1/auth/logout", ft_access_token=access, ft_refresh_token=second)
+    assert response.status_code == 200
+    assert set_cookies(response) == {"ft_access_token": "", "ft_refresh_token": ""}
+    assert all(tokens.by_hash(AuthService.hash_refresh_token(t)).revoked_at is not None for t in (first, second))
+    assert token_revocation.is_revoked(jti)
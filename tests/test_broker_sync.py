@@ -0,0 +1,199 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Query
+
+from src.schemas.accounts import Account
+from src.services import broker_sync
+from src.services.broker_sync import BrokerSyncScheduler, ICMarketsReportClient, MT5WebApiClient
+
+
+class FakeDB:
+    """Хранилище вместо Postgres: сделки и курсоры, сохранённые через commit"""
+
+    def __init__(self):
+        self.deals: dict[tuple[int, str], object] = {}
+        self.cursors: dict[int, str | None] = {}
+        self.states: dict[int, tuple[float, float, float]] = {}
+        self.commits = 0
+
+
+class FakeDBManager:
+    def __init__(self, store: FakeDB):
+        self.store = store
+        self._deals = []
+        self._cursors = {}
+        self._states = {}
+        self.deals = self
+        self.accounts = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def add_bulk(self, deals):
+        self._deals.extend(deals)
+
+    async def update_sync_cursor(self, account_id, cursor):
+        self._cursors[account_id] = cursor
+
+    async def update_state(self, account_id, balance, equity):
+        peak = self.store.states.get(account_id, (0.0, 0.0, 0.0))[2]
+        self._states[account_id] = (balance, equity, max(peak, equity))
+
+    async def commit(self):
+        for deal in self._deals:
+            self.store.deals[(deal.account_id, deal.ticket)] = deal
+        self.store.cursors.update(self._cursors)
+        self.store.states.update(self._states)
+        self.store.commits += 1
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeDB()
+    monkeypatch.setattr(broker_sync, "DBManager", lambda session_factory: FakeDBManager(store))
+    return store
+
+
+def mock_broker(deals_count: int, fail_after: int | None = None) -> FastAPI:
+    """Локальный Report API: сделки с ticket 1..deals_count, опционально ошибка после ticket fail_after"""
+    app = FastAPI()
+    app.state.requests = []
+    app.state.equity = 1000.0
+
+    @app.get("/accounts/{account}/summary")
+    async def summary(account: str):
+        return {"balance": 1000.0, "equity": app.state.equity}
+
+    @app.get("/accounts/{account}/deals")
+    async def deals(account: str, limit: int, after: int = 0):
+        app.state.requests.append(after)
+        if fail_after is not None and after >= fail_after:
+            raise HTTPException(status_code=503)
+        tickets = range(after + 1, min(after + limit, deals_count) + 1)
+        return {"deals": [
+            {
+                "ticket": ticket, "symbol": "EURUSD", "side": "buy", "volume": 0.1, "price": 1.1,
+                "profit": 1.0, "time": "2026-01-01T00:00:00Z",
+            }
+            for ticket in tickets
+        ]}
+
+    return app
+
+
+def account(broker: str = "icmarkets", cursor: str | None = None) -> Account:
+    return Account(id=1, user_id=1, account="1001", type="real", broker=broker, sync_cursor=cursor)
+
+
+def scheduler(app: FastAPI, client) -> BrokerSyncScheduler:
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://broker")
+    return BrokerSyncScheduler(None, http, {client.name: client})
+
+
+def test_pages_are_saved_with_cursor(store):
+    app = mock_broker(deals_count=7)
+    sync = scheduler(app, ICMarketsReportClient("http://broker", page_size=3))
+
+    assert asyncio.run(sync.sync_account(account())) == 7
+    assert len(store.deals) == 7
+    assert store.commits == 4  # Страница - отдельная транзакция, плюс состояние счёта
+    assert store.cursors[1] == "7"
+    assert app.state.requests == [0, 3, 6]
+    assert store.states[1] == (1000.0, 1000.0, 1000.0)
+
+    # Следующий цикл запрашивает только сделки после курсора, peak_equity не снижается
+    app.state.equity = 900.0
+    assert asyncio.run(sync.sync_account(account(cursor="7"))) == 0
+    assert app.state.requests[-1] == 7
+    assert store.commits == 5
+    assert store.states[1] == (1000.0, 900.0, 1000.0)
+
+
+def test_failure_keeps_progress_and_backs_off(store):
+    app = mock_broker(deals_count=10, fail_after=3)
+    sync = scheduler(app, ICMarketsReportClient("http://broker", page_size=3))
+
+    assert asyncio.run(sync.sync_account(account())) == 3
+    assert store.cursors[1] == "3"
+    assert not sync._is_due(1, time.monotonic())
+    first_delay = sync._backoff[1].next_attempt - time.monotonic()
+
+    asyncio.run(sync.sync_account(account(cursor="3")))
+    assert sync._backoff[1].failures == 2
+    assert sync._backoff[1].next_attempt - time.monotonic() > first_delay
+
+    # После восстановления брокера продолжаем с сохранённого курсора, задержка сбрасывается
+    ok = scheduler(mock_broker(deals_count=10), ICMarketsReportClient("http://broker", page_size=3))
+    ok._backoff = sync._backoff
+    assert asyncio.run(ok.sync_account(account(cursor="3"))) == 7
+    assert store.cursors[1] == "10"
+    assert 1 not in ok._backoff
+
+
+def mock_mt5(deal_times: list[int]) -> FastAPI:
+    """Локальный MT5 WebAPI: по сделке на каждое время из deal_times"""
+    app = FastAPI()
+    app.state.requests = []
+
+    @app.get("/api/user/account/get")
+    async def account_get(login: str):
+        return {"retcode": "0 Done", "answer": {"Login": login, "Balance": "500.00", "Equity": "480.50"}}
+
+    @app.get("/api/deal/get_batch")
+    async def get_batch(login: str, date_from: int = Query(alias="from"), date_to: int = Query(alias="to")):
+        app.state.requests.append((date_from, date_to))
+        answer = [
+            {"Deal": 55 + i, "Action": 0, "Symbol": "XAUUSD", "Volume": 1000, "Price": "2400.5", "Time": deal_time}
+            for i, deal_time in enumerate(deal_times)
+            if date_from <= deal_time <= date_to
+        ]
+        return {"retcode": "0 Done", "answer": answer}
+
+    return app
+
+
+def test_mt5_cursor_skips_already_synced_second(store):
+    deal_time = int(time.time()) - 3600
+    app = mock_mt5([deal_time])
+    client = MT5WebApiClient("http://broker", window=24 * 3600)
+    sync = scheduler(app, client)
+
+    cursor = str(deal_time - 10)
+    assert asyncio.run(sync.sync_account(account("mt5", cursor))) == 1
+    deal = store.deals[(1, "55")]
+    assert deal.volume == 0.1 and deal.time == datetime.fromtimestamp(deal_time, tz=timezone.utc)
+    # Курсор - за концом просмотренного окна, а не за сделкой
+    scanned_to = int(store.cursors[1])
+    assert scanned_to > deal_time + 1
+    assert app.state.requests[-1][1] == scanned_to - 1
+
+    # Следующий цикл начинает с непросмотренной секунды
+    requests = len(app.state.requests)
+    assert asyncio.run(sync.sync_account(account("mt5", store.cursors[1]))) == 0
+    assert all(date_from == scanned_to for date_from, _ in app.state.requests[requests:])
+
+
+def test_mt5_account_without_deals_does_not_rescan_history(store):
+    app = mock_mt5([])
+    client = MT5WebApiClient("http://broker", history_start=int(time.time()) - 100 * 24 * 3600)
+    sync = scheduler(app, client)
+
+    assert asyncio.run(sync.sync_account(account("mt5"))) == 0
+    assert len(app.state.requests) == 4  # 100 дней окнами по 30
+    scanned_to = app.state.requests[-1][1] + 1
+    assert store.cursors[1] == str(scanned_to)
+    assert store.commits == 2  # Курсор за цикл без сделок и состояние счёта
+    assert store.states[1] == (500.0, 480.5, 480.5)
+
+    # Следующий цикл запрашивает только новый хвост, без повторного прохода по истории
+    requests = len(app.state.requests)
+    assert asyncio.run(sync.sync_account(account("mt5", store.cursors[1]))) == 0
+    assert len(app.state.requests) - requests <= 1
+    assert all(date_from == scanned_to for date_from, _ in app.state.requests[requests:])
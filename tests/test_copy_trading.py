@@ -0,0 +1,72 @@
+import numpy as np
+
+from src.schemas.copy_trading import BrokerLimits, TradeSignal
+from src.services.copy_trading import CopyTradeSizer, FollowerBook
+
+SIGNAL = TradeSignal(symbol="EURUSD", side="buy", volume=1.0, master_balance=10_000.0)
+
+
+def book(**columns) -> FollowerBook:
+    """Счета последователей без просадки и лимитов, параметры переопределяются списками"""
+    size = len(next(iter(columns.values())))
+    defaults = {
+        "account_ids": np.arange(1, size + 1),
+        "balance": [10_000.0] * size,
+        "equity": [10_000.0] * size,
+        "peak_equity": [10_000.0] * size,
+        "lot_multiplier": [1.0] * size,
+        "max_drawdown": [0.3] * size,
+        "max_lot": [np.nan] * size,
+    }
+    return FollowerBook(**(defaults | columns))
+
+
+def volumes(follower_book: FollowerBook, limits: BrokerLimits | None = None) -> list:
+    return CopyTradeSizer(limits).compute_volumes(SIGNAL, follower_book).tolist()
+
+
+def test_volume_is_proportional_to_balance_and_multiplier():
+    assert volumes(book(balance=[10_000.0, 5_000.0, 2_500.0], lot_multiplier=[1.0, 2.0, 1.0])) == [1.0, 1.0, 0.25]
+
+
+def test_drawdown_throttles_volume_linearly():
+    # Просадка 0%, 10% и 20% (= лимит) при max_drawdown 20%
+    assert volumes(book(
+        equity=[1_000.0, 900.0, 800.0], peak_equity=[1_000.0] * 3, max_drawdown=[0.2] * 3,
+    )) == [1.0, 0.5, 0.0]
+
+
+def test_non_positive_max_drawdown_stops_copying():
+    assert volumes(book(max_drawdown=[0.0, -0.1, 0.3])) == [0.0, 0.0, 1.0]
+
+
+def test_account_and_broker_caps():
+    follower_book = book(balance=[50_000.0] * 3, max_lot=[0.3, np.nan, 10.0])
+    assert volumes(follower_book) == [0.3, 5.0, 5.0]  # NaN - без лимита счёта
+    assert volumes(follower_book, BrokerLimits(max_lot=2.0)) == [0.3, 2.0, 2.0]
+
+
+def test_volume_is_rounded_down_to_lot_step():
+    assert volumes(book(balance=[2_570.0, 2_999.0])) == [0.25, 0.29]
+    assert volumes(book(balance=[2_999.0, 3_000.0]), BrokerLimits(lot_step=0.1, min_lot=0.1)) == [0.2, 0.3]
+
+
+def test_volume_below_min_lot_is_not_sent():
+    assert volumes(book(balance=[90.0, 100.0])) == [0.0, 0.01]
+
+
+def test_size_orders_skips_zero_volumes():
+    orders = CopyTradeSizer().size_orders(SIGNAL, book(balance=[10_000.0, 50.0]))
+    assert [(order.account_id, order.volume) for order in orders] == [(1, 1.0)]
+
+
+def test_from_accounts_keeps_only_autofollow():
+    class Row:
+        def __init__(self, id, autofollow, max_lot=None):
+            self.id, self.autofollow, self.max_lot = id, autofollow, max_lot
+            self.balance = self.equity = self.peak_equity = 1_000.0
+            self.lot_multiplier, self.max_drawdown = 1.0, 0.3
+
+    follower_book = FollowerBook.from_accounts([Row(1, True), Row(2, False), Row(3, True, 0.5)])
+    assert follower_book.account_ids.tolist() == [1, 3]
+    assert np.isnan(follower_book.max_lot[0]) and follower_book.max_lot[1] == 0.5
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from src.schemas.jobs import Job
+from src.services import job_queue
+from src.services.job_queue import JobWorker, job_handler
+
+
+class FakeJobs:
+    """Вместо JobsRepository: фиксирует отметки выполнения и итог задачи"""
+
+    def __init__(self):
+        self.heartbeats: list[int] = []
+        self.completed: list[int] = []
+        self.failed: list[tuple[int, float | None]] = []
+
+    async def heartbeat(self, job_id):
+        self.heartbeats.append(job_id)
+
+    async def complete(self, job_id):
+        self.completed.append(job_id)
+
+    async def fail(self, job, error, retry_in):
+        self.failed.append((job.id, retry_in))
+
+
+class FakeDBManager:
+    def __init__(self, jobs: FakeJobs):
+        self.jobs = jobs
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    jobs = FakeJobs()
+    monkeypatch.setattr(job_queue, "DBManager", lambda session_factory: FakeDBManager(jobs))
+    monkeypatch.setattr(job_queue, "_handlers", {})
+    return jobs
+
+
+def job(kind: str, attempts: int = 1, max_attempts: int = 5) -> Job:
+    return Job(
+        id=1, kind=kind, payload={}, status="running", attempts=attempts, max_attempts=max_attempts,
+        run_at=datetime.now(timezone.utc),
+    )
+
+
+def test_long_job_keeps_lock_fresh(jobs):
+    @job_handler("test.slow")
+    async def slow(payload):
+        await asyncio.sleep(0.25)
+
+    worker = JobWorker(None, stale_after=0.2)  # Отметка каждые 0.05 с
+    asyncio.run(worker._execute(job("test.slow")))
+
+    assert len(jobs.heartbeats) >= 3
+    assert jobs.completed == [1]
+
+    # После завершения задачи отметки прекращаются
+    count = len(jobs.heartbeats)
+    asyncio.run(asyncio.sleep(0.1))
+    assert len(jobs.heartbeats) == count
+
+
+def test_failed_job_is_retried_then_dead(jobs):
+    @job_handler("test.broken")
+    async def broken(payload):
+        raise RuntimeError("boom")
+
+    worker = JobWorker(None, base_backoff=10.0)
+    asyncio.run(worker._execute(job("test.broken", attempts=2)))
+    asyncio.run(worker._execute(job("test.broken", attempts=5)))
+
+    assert jobs.failed == [(1, 20.0), (1, None)]
+    assert jobs.heartbeats == []
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.services.leaderboard import StrategyLeaderboard, strategy_stats
+
+
+def ranking(leaderboard: StrategyLeaderboard) -> list[str]:
+    return [stats.strategy for stats in leaderboard._build(datetime.now(timezone.utc)).strategies]
+
+
+def test_returns_and_drawdown_from_equity():
+    daily_pnl = np.zeros(30)
+    daily_pnl[-10], daily_pnl[-1] = -100.0, 200.0
+    stats = strategy_stats("aggressive", followers=2, aum=1_100.0, daily_pnl=daily_pnl)
+
+    assert stats.pnl_30d == 100.0
+    assert stats.return_30d == round(1_100.0 / 1_000.0 - 1, 6)
+    assert stats.return_7d == round(1_100.0 / 900.0 - 1, 6)
+    assert stats.max_drawdown_30d == 0.1
+
+
+def test_ranking_falls_back_to_pnl_without_equity():
+    today = datetime.now(timezone.utc).date()
+    leaderboard = StrategyLeaderboard()
+    leaderboard.apply_totals({"aggressive": (1, 0.0), "conservative": (2, 0.0)})
+    leaderboard.apply_daily_pnl([("aggressive", today, -10.0), ("conservative", today, 50.0)])
+    assert ranking(leaderboard) == ["conservative", "aggressive"]
+
+    # С equity счетов рейтинг определяется доходностью
+    leaderboard.apply_totals({"aggressive": (1, 500.0), "conservative": (2, 10_000.0)})
+    leaderboard.apply_daily_pnl([("aggressive", today, 110.0)])
+    assert ranking(leaderboard) == ["aggressive", "conservative"]
@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from src.utils import repo_cache
+from src.utils.repo_cache import RepositoryCache
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def tags(item: Item) -> list[tuple]:
+    return [("id", item.id)]
+
+
+class Loader:
+    """Счётчик обращений к «БД»; ответ можно придержать через gate"""
+
+    def __init__(self, value: Item | None):
+        self.value = value
+        self.calls = 0
+        self.gate: asyncio.Event | None = None
+
+    async def __call__(self) -> Item | None:
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return None if self.value is None else self.value.model_copy()
+
+
+def test_hit_returns_independent_copy():
+    async def scenario():
+        cache = RepositoryCache()
+        loader = Loader(Item(id=1, name="a"))
+        first = await cache.get_or_load(("id", 1), loader, tags)
+        first.name = "changed"
+        second = await cache.get_or_load(("id", 1), loader, tags)
+        return loader.calls, second, cache.stats()
+
+    calls, second, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert second == Item(id=1, name="a")
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_none_is_not_cached():
+    async def scenario():
+        cache = RepositoryCache()
+        loader = Loader(None)
+        await cache.get_or_load(("id", 1), loader, tags)
+        await cache.get_or_load(("id", 1), loader, tags)
+        return loader.calls
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_concurrent_misses_are_coalesced():
+    async def scenario():
+        cache = RepositoryCache()
+        loader = Loader(Item(id=1, name="a"))
+        loader.gate = asyncio.Event()
+        waiters = [asyncio.create_task(cache.get_or_load(("id", 1), loader, tags)) for _ in range(5)]
+        await asyncio.sleep(0)
+        loader.gate.set()
+        return loader.calls, await asyncio.gather(*waiters), cache.stats()["coalesced"]
+
+    calls, results, coalesced = asyncio.run(scenario())
+    assert calls == 1 and coalesced == 4
+    assert all(result == Item(id=1, name="a") for result in results)
+    assert len({id(result) for result in results}) == 5
+
+
+def test_invalidation_during_load_is_not_cached():
+    async def scenario():
+        cache = RepositoryCache()
+        loader = Loader(Item(id=1, name="stale"))
+        loader.gate = asyncio.Event()
+        load = asyncio.create_task(cache.get_or_load(("id", 1), loader, tags))
+        await asyncio.sleep(0)
+        cache.invalidate(("id", 1))  # Запись изменена и закоммичена, пока шло чтение
+        loader.gate.set()
+        stale = await load
+
+        loader.gate, loader.value = None, Item(id=1, name="fresh")
+        fresh = await cache.get_or_load(("id", 1), loader, tags)
+        return stale, fresh, loader.calls
+
+    stale, fresh, calls = asyncio.run(scenario())
+    assert stale.name == "stale"
+    assert fresh.name == "fresh" and calls == 2
+
+
+def test_invalidate_by_tag_drops_only_tagged_records():
+    async def scenario():
+        cache = RepositoryCache()
+        first, second = Loader(Item(id=1, name="a")), Loader(Item(id=2, name="b"))
+        await cache.get_or_load(("id", 1), first, tags)
+        await cache.get_or_load(("login", "a"), first, tags)
+        await cache.get_or_load(("id", 2), second, tags)
+        cache.invalidate(("id", 1))
+        for key in (("id", 1), ("login", "a")):
+            await cache.get_or_load(key, first, tags)
+        await cache.get_or_load(("id", 2), second, tags)
+        return first.calls, second.calls
+
+    assert asyncio.run(scenario()) == (4, 1)
+
+
+def test_ttl_and_lru_eviction(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(repo_cache.time, "monotonic", lambda: now[0])
+
+    async def scenario():
+        cache = RepositoryCache(maxsize=2, ttl=10.0)
+        loaders = {i: Loader(Item(id=i, name=str(i))) for i in (1, 2, 3)}
+        for i in (1, 2):
+            await cache.get_or_load(("id", i), loaders[i], tags)
+        await cache.get_or_load(("id", 1), loaders[1], tags)  # 1 - недавно использованная
+        await cache.get_or_load(("id", 3), loaders[3], tags)  # Вытесняет 2
+        await cache.get_or_load(("id", 2), loaders[2], tags)
+        evictions = cache.stats()["evictions"]
+
+        now[0] += 11
+        await cache.get_or_load(("id", 3), loaders[3], tags)
+        return [loaders[i].calls for i in (1, 2, 3)], evictions
+
+    calls, evictions = asyncio.run(scenario())
+    assert calls == [1, 2, 2]
+    assert evictions == 2
+
+
+def test_loader_error_reaches_waiters_and_is_not_cached():
+    async def scenario():
+        cache = RepositoryCache()
+        gate = asyncio.Event()
+
+        async def failing():
+            await gate.wait()
+            raise RuntimeError("db down")
+
+        tasks = [asyncio.create_task(cache.get_or_load(("id", 1), failing, tags)) for _ in range(2)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return results, await cache.get_or_load(("id", 1), Loader(Item(id=1, name="a")), tags)
+
+    results, value = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert value.name == "a"
+
+
+@pytest.mark.parametrize("cancel_waiter", [False, True])
+def test_cancelled_load(cancel_waiter):
+    async def scenario():
+        cache = RepositoryCache()
+        loader = Loader(Item(id=1, name="a"))
+        loader.gate = asyncio.Event()
+        owner = asyncio.create_task(cache.get_or_load(("id", 1), loader, tags))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_load(("id", 1), loader, tags))
+        await asyncio.sleep(0)
+        (waiter if cancel_waiter else owner).cancel()
+        await asyncio.sleep(0)
+        loader.gate.set()
+        survivor = owner if cancel_waiter else waiter
+        return await survivor, loader.calls
+
+    value, calls = asyncio.run(scenario())
+    assert value == Item(id=1, name="a")
+    # Отмена исходного запроса - ожидающий читает сам
+    assert calls == (1 if cancel_waiter else 2)
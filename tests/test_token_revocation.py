@@ -0,0 +1,66 @@
+import pytest
+
+from src.services import token_revocation as module
+from src.services.token_revocation import BloomFilter, RevocationStore
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(module.time, "time", clock)
+    return clock
+
+
+@pytest.mark.parametrize("use_bloom", [True, False])
+def test_revoked_until_token_expires(clock, use_bloom):
+    store = RevocationStore(use_bloom=use_bloom, bloom_capacity=100)
+    store.add("a", clock.now + 60)
+    store.add("expired", clock.now - 1)  # Истёкший токен отзывать незачем
+
+    assert store.is_revoked("a")
+    assert not store.is_revoked("b") and not store.is_revoked(None)
+    assert len(store) == 1
+
+    clock.now += 61
+    assert not store.is_revoked("a")
+    assert len(store) == 0
+
+
+def test_readding_extends_expiry(clock):
+    store = RevocationStore(bloom_capacity=100)
+    store.add("a", clock.now + 10)
+    store.add("a", clock.now + 100)
+
+    clock.now += 50
+    assert store.is_revoked("a")
+
+
+def test_bloom_is_rebuilt_after_purge(clock):
+    store = RevocationStore(bloom_capacity=100)
+    for i in range(10):
+        store.add(f"old-{i}", clock.now + 10)
+    store.add("live", clock.now + 1000)
+    bloom = store._bloom
+
+    clock.now += 11
+    assert not store.is_revoked("old-0")  # Попадание в фильтр запускает очистку
+    assert store._bloom is not bloom
+    assert all(f"old-{i}" not in store._bloom for i in range(10))
+    assert store.is_revoked("live")
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert sum(f"other-{i}" in bloom for i in range(1000)) < 50